@@ -0,0 +1,147 @@
+"""Офлайн-бенчмарк режимов парсера.
+
+Каждый режим запускается в отдельном процессе против ReplayServer
+и измеряется: страниц в секунду, суммарное время загрузки, разбора,
+поиска тегов и извлечения данных (по хукам profiling) и пиковый RSS
+процесса. Результаты сохраняются в JSON, который можно сравнить
+с прошлым запуском через --compare.
+
+    python benchmarks/mode_benchmark.py --latency 20 --workers 8
+    python benchmarks/mode_benchmark.py pep --compare old.json
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import datetime as dt
+import json
+import multiprocessing
+from pathlib import Path
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from replay import ReplayAdapter, ReplayServer, build_site, load_site
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+RESULTS_DIR = BENCHMARKS_DIR / 'results'
+MODES = ('whats-new', 'latest-versions', 'download', 'pep')
+STAGES = ('fetch', 'parse', 'find', 'extract')
+RESULT_ROW = (
+    '{mode:<16} {pages:>6} стр. {pages_per_second:>9.1f} стр./с '
+    'fetch {fetch:>7.3f} с  parse {parse:>7.3f} с  find {find:>7.3f} с  '
+    'extract {extract:>7.3f} с  RSS {peak_rss_kib:>8} КиБ{change}'
+)
+
+
+def run_mode(mode, replay_url, workers, warm):
+    sys.path.append(str(SRC_DIR))
+    import main
+    import profiling
+    from http_cache import create_session
+
+    session = create_session(backend='memory')
+    session.mount('https://', ReplayAdapter(
+        replay_url, pool_connections=2, pool_maxsize=max(10, workers)
+    ))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        main.BASE_DIR = Path(temp_dir)
+        main.PEP_SNAPSHOT_FILE = Path(temp_dir) / 'pep_snapshot.json'
+        options = dict(workers=workers)
+        if warm:
+            main.MODE_TO_FUNCTION[mode](session, **options)
+        profiler = profiling.enable()
+        started = time.perf_counter()
+        main.MODE_TO_FUNCTION[mode](session, **options)
+        wall_time = time.perf_counter() - started
+    profiling.disable()
+    pages = profiler.calls('fetch')
+    totals = profiler.totals()
+    return {
+        'pages': pages,
+        'wall_time': wall_time,
+        'pages_per_second': pages / wall_time,
+        'stages': {stage: totals[stage] for stage in STAGES},
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=BENCHMARKS_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_change(result, previous):
+    if previous is None:
+        return ''
+    change = result['pages_per_second'] / previous['pages_per_second'] - 1
+    return f'  {change:+.1%}'
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'modes', nargs='*', metavar='MODE', help=', '.join(MODES)
+    )
+    parser.add_argument('--pages', type=Path, help='Директория со страницами')
+    parser.add_argument('--pep-count', type=int, default=600)
+    parser.add_argument('--latency', type=float, default=0, help='мс')
+    parser.add_argument('--jitter', type=float, default=0, help='мс')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--warm', action='store_true')
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    return parser
+
+
+def main():
+    parser = configure_argument_parser()
+    args = parser.parse_args()
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f'Неизвестные режимы: {", ".join(sorted(unknown))}')
+    site = (
+        load_site(args.pages) if args.pages
+        else build_site(pep_count=args.pep_count)
+    )
+    previous = {}
+    if args.compare:
+        previous = json.loads(args.compare.read_text())['results']
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    with ReplayServer(site, args.latency / 1000, args.jitter / 1000) as server:
+        for mode in args.modes or MODES:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                result = executor.submit(
+                    run_mode, mode, server.url,
+                    args.workers, args.warm
+                ).result()
+            results[mode] = result
+            print(RESULT_ROW.format(
+                mode=mode, **result, **result['stages'],
+                change=format_change(result, previous.get(mode))
+            ))
+    now = dt.datetime.now()
+    output = args.output or RESULTS_DIR / f'{now:%Y-%m-%d_%H-%M-%S}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'commit': get_commit(),
+        'created': now.isoformat(),
+        'options': {
+            'latency': args.latency, 'jitter': args.jitter,
+            'workers': args.workers,
+            'warm': args.warm, 'pages': len(site),
+        },
+        'results': results,
+    }, indent=2))
+    print(f'Результаты сохранены: {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Сравнение полного и выборочного разбора страниц.
+
+Запуск из корня проекта:
+
+    python benchmarks/parse_benchmark.py pep page1.html page2.html
+    python benchmarks/parse_benchmark.py whats-new --url \
+        https://docs.python.org/3/whatsnew/3.11.html
+"""
+import argparse
+from pathlib import Path
+import statistics
+import sys
+import time
+import tracemalloc
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+MODES = ('pep', 'whats-new')
+RESULT_ROW = '{path:<8} {mode:<10} {time:>12.3f} мс {memory:>12.1f} КиБ'
+
+
+def get_extractors(mode):
+    """Возвращает полный и выборочный разбор страницы режима."""
+    from extractors import extract_pep_status, extract_whats_new_page
+    from utils import find_tag, parse_html
+
+    def full_pep_status(html):
+        status_tag = parse_html(html).find(string='Status')
+        return status_tag.find_next('abbr').text
+
+    def full_whats_new_page(html):
+        soup = parse_html(html)
+        return (
+            find_tag(soup, 'h1').text,
+            find_tag(soup, 'dl').text.replace('\n', ' ')
+        )
+
+    return {
+        'pep': (full_pep_status, extract_pep_status),
+        'whats-new': (full_whats_new_page, extract_whats_new_page),
+    }[mode]
+
+
+def measure(extract, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        for html in pages:
+            started = time.perf_counter()
+            extract(html)
+            timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    for html in pages:
+        extract(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.mean(timings) * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('mode', choices=MODES)
+    parser.add_argument('files', nargs='*', type=Path)
+    parser.add_argument('--url', action='append', default=[])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    sys.path.append(str(SRC_DIR))
+    from http_cache import create_session
+    from utils import get_response
+
+    pages = [path.read_text(encoding='utf-8') for path in args.files]
+    if args.url:
+        session = create_session()
+        pages.extend(get_response(session, url).text for url in args.url)
+    if not pages:
+        parser.error('Нужен хотя бы один файл или --url')
+    full, fast = get_extractors(args.mode)
+    if any(full(html) != fast(html) for html in pages):
+        sys.exit('Выборочный разбор вернул другие данные')
+    for path, extract in (('full', full), ('fast', fast)):
+        time_ms, memory_kib = measure(extract, pages, args.repeat)
+        print(RESULT_ROW.format(
+            path=path, mode=args.mode, time=time_ms, memory=memory_kib
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""Локальное воспроизведение docs.python.org и peps.python.org.
+
+Страницы берутся из директории, сохранённой по схеме <хост>/<путь>
+(например, `wget -x`), или генерируются build_site() по образцу
+разметки настоящих сайтов.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+from pathlib import Path
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+
+STATUS_LETTERS = {
+    'Active': 'A', 'Accepted': 'A', 'Deferred': 'D', 'Final': 'F',
+    'Provisional': 'P', 'Rejected': 'R', 'Superseded': 'S',
+    'Withdrawn': 'W', 'Draft': '',
+}
+PARAGRAPH = '<p>' + 'Lorem ipsum <code>dolor</code> sit amet. ' * 20 + '</p>'
+PAGE = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+    '<title>{title}</title></head><body>{body}</body></html>'
+)
+
+
+def page(title, body, sections=30):
+    return PAGE.format(
+        title=title, body=body + PARAGRAPH * sections
+    ).encode('utf-8')
+
+
+def build_site(pep_count=600, versions=12, archive_size=5 * 2 ** 20):
+    site = {}
+    sidebar = ''.join(
+        f'<li><a href="https://docs.python.org/3.{minor}/">'
+        f'Python 3.{minor} (stable)</a></li>'
+        for minor in range(versions)
+    )
+    site['docs.python.org/3/'] = page('Python 3 documentation', (
+        '<div class="sphinxsidebarwrapper"><ul><li>Docs by version</li>'
+        f'{sidebar}<li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li></ul></div>'
+    ))
+    toctree = ''.join(
+        f'<li class="toctree-l1"><a href="3.{minor}.html">'
+        f'What’s New In Python 3.{minor}</a></li>'
+        for minor in range(versions)
+    )
+    site['docs.python.org/3/whatsnew/'] = page('What’s New', (
+        '<section id="what-s-new-in-python"><h1>What’s New</h1>'
+        f'<div class="toctree-wrapper"><ul>{toctree}</ul></div></section>'
+    ))
+    for minor in range(versions):
+        site[f'docs.python.org/3/whatsnew/3.{minor}.html'] = page(
+            f'What’s New In Python 3.{minor}',
+            f'<h1>What’s New In Python 3.{minor}</h1><dl><dt>Editor</dt>'
+            f'<dd><p>Editor {minor}</p></dd></dl>'
+        )
+    site['docs.python.org/3/download.html'] = page('Download', (
+        '<div role="main"><table class="docutils"><tr><td>'
+        '<a href="archives/python-docs-pdf-a4.zip">Download</a>'
+        '</td></tr></table></div>'
+    ))
+    site['docs.python.org/3/archives/python-docs-pdf-a4.zip'] = os.urandom(
+        archive_size
+    )
+    statuses = list(STATUS_LETTERS)
+    rows = []
+    for number in range(1, pep_count + 1):
+        status = statuses[number % len(statuses)]
+        rows.append(
+            f'<tr><td><abbr title="Standards Track, {status}">'
+            f'S{STATUS_LETTERS[status]}</abbr></td>'
+            f'<td><a href="pep-{number:04d}/">{number}</a></td></tr>'
+        )
+        site[f'peps.python.org/pep-{number:04d}/'] = page(
+            f'PEP {number}',
+            '<dl class="rfc2822 field-list simple"><dt>Status</dt>'
+            f'<dd><abbr>{status}</abbr></dd></dl>'
+        )
+    site['peps.python.org/'] = page('PEP 0', (
+        '<table class="pep-zero-table docutils align-default">'
+        f'{"".join(rows)}</table>'
+    ))
+    return site
+
+
+def load_site(directory):
+    site = {}
+    for path in Path(directory).rglob('*'):
+        if path.is_file():
+            key = path.relative_to(directory).as_posix()
+            if key.endswith('index.html'):
+                key = key[:-len('index.html')]
+            site[key] = path.read_bytes()
+    return site
+
+
+class ReplayServer:
+    """HTTP-сервер, отдающий страницы site с искусственной задержкой."""
+
+    def __init__(self, site, latency=0.0, jitter=0.0):
+        self.site = site
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                time.sleep(max(0.0, latency + random.uniform(0, jitter)))
+                body = server.site.get(self.path.lstrip('/'))
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header(
+                    'Content-Length',
+                    str(len(server.site.get(self.path.lstrip('/'), b'')))
+                )
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Перенаправляет запросы к настоящим сайтам на ReplayServer."""
+
+    def __init__(self, replay_url, **kwargs):
+        self.replay_url = replay_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f'{self.replay_url}/{parts.netloc}{parts.path}'
+        return super().send(request, **kwargs)
@@ -0,0 +1,164 @@
+"""Бенчмарк времени запуска парсера.
+
+Каждая команда запускается --repeat раз в новом процессе; печатается
+медиана времени запуска сверх пустого интерпретатора, суммарное время
+импортов по -X importtime, самые медленные импорты и загруженные
+тяжёлые зависимости. Результаты сохраняются в JSON, который можно
+сравнить с прошлым запуском через --compare.
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --compare old.json
+"""
+import argparse
+import datetime as dt
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+RESULTS_DIR = BENCHMARKS_DIR / 'results'
+COMMANDS = {
+    'help': ['main.py', '-h'],
+    'bad-args': ['main.py', 'unknown-mode'],
+    'import': ['-c', 'import main'],
+}
+HEAVY_MODULES = (
+    'bs4', 'lxml', 'multiprocessing', 'prettytable', 'requests',
+    'requests_cache', 'tqdm', 'urllib3',
+)
+RESULT_ROW = (
+    '{command:<10} {wall_time:>8.1f} мс  импорты {import_time:>7.1f} мс  '
+    'тяжёлые: {heavy}{change}'
+)
+SLOWEST_ROW = '    {cumulative:>7.1f} мс  {module}'
+
+
+def parse_importtime(stderr):
+    """Возвращает {модуль: (собственное, суммарное время в мс)} и
+    список модулей верхнего уровня в порядке импорта."""
+    modules = {}
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        module = name.strip()
+        modules[module] = (int(own) / 1000, int(cumulative) / 1000)
+        if not name[1:].startswith(' '):
+            top_level.append(module)
+    return modules, top_level
+
+
+def run(args, cwd):
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, cwd=cwd
+    )
+    return time.perf_counter() - started, completed
+
+
+def measure(args, repeat, baseline, startup_modules, cwd):
+    wall_times = [run(args, cwd)[0] for _ in range(repeat)]
+    _, completed = run(['-X', 'importtime', *args], cwd)
+    modules, top_level = parse_importtime(completed.stderr)
+    project = [
+        module for module in top_level if module not in startup_modules
+    ]
+    return {
+        'wall_time': (statistics.median(wall_times) - baseline) * 1000,
+        'import_time': sum(modules[module][1] for module in project),
+        'heavy': sorted(set(HEAVY_MODULES) & set(modules)),
+        'slowest': sorted(
+            ((modules[module][1], module) for module in project),
+            reverse=True
+        )[:5],
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=BENCHMARKS_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_change(result, previous):
+    if previous is None:
+        return ''
+    return f'  {result["wall_time"] - previous["wall_time"]:+.1f} мс'
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'commands', nargs='*', metavar='COMMAND', help=', '.join(COMMANDS)
+    )
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    return parser
+
+
+def main():
+    parser = configure_argument_parser()
+    args = parser.parse_args()
+    unknown = set(args.commands) - set(COMMANDS)
+    if unknown:
+        parser.error(f'Неизвестные команды: {", ".join(sorted(unknown))}')
+    previous = {}
+    if args.compare:
+        previous = json.loads(args.compare.read_text())['results']
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Логи запусков не должны попадать в src/logs
+        work_dir = Path(temp_dir)
+        for path in SRC_DIR.glob('*.py'):
+            (work_dir / path.name).write_bytes(path.read_bytes())
+        baseline = statistics.median(
+            run(['-c', 'pass'], work_dir)[0] for _ in range(args.repeat)
+        )
+        # Модули, которые интерпретатор загружает и без парсера
+        startup_modules = set(parse_importtime(
+            run(['-X', 'importtime', '-c', 'pass'], work_dir)[1].stderr
+        )[0])
+        for command in args.commands or COMMANDS:
+            result = measure(
+                COMMANDS[command], args.repeat, baseline, startup_modules,
+                work_dir
+            )
+            results[command] = result
+            print(RESULT_ROW.format(
+                command=command,
+                wall_time=result['wall_time'],
+                import_time=result['import_time'],
+                heavy=', '.join(result['heavy']) or '—',
+                change=format_change(result, previous.get(command))
+            ))
+            for cumulative, module in result['slowest']:
+                print(SLOWEST_ROW.format(
+                    cumulative=cumulative, module=module
+                ))
+    now = dt.datetime.now()
+    output = args.output or (
+        RESULTS_DIR / f'startup_{now:%Y-%m-%d_%H-%M-%S}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'commit': get_commit(),
+        'created': now.isoformat(),
+        'baseline': baseline * 1000,
+        'results': results,
+    }, indent=2))
+    print(f'Результаты сохранены: {output}')
+
+
+if __name__ == '__main__':
+    main()
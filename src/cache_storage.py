@@ -0,0 +1,194 @@
+import threading
+import time
+import zlib
+
+from requests_cache import CachedSession
+from requests_cache.backends.sqlite import SQLiteCache, SQLiteDict
+from requests_cache.serializers import SerializerPipeline, Stage
+from requests_cache.serializers.preconf import pickle_serializer
+
+from constants import CACHE_MAX_RESPONSE_SIZE, UNCACHED_CONTENT_TYPES
+
+
+CACHE_STATS_MESSAGE = (
+    'HTTP-кеш: записей {entries}, {size} байт, '
+    'попаданий {hits} из {lookups} ({hit_rate:.1%})'
+)
+# После вытеснения кеш занимает не больше этой доли предела, чтобы
+# не вытеснять записи при каждом сохранении
+EVICTION_TARGET = 0.9
+
+
+def decompress(data):
+    # Записи, сохранённые до сжатия, читаются как есть
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return data
+
+
+compressed_serializer = SerializerPipeline(
+    [*pickle_serializer.stages, Stage(dumps=zlib.compress, loads=decompress)],
+    name='pickle-zlib',
+    is_binary=True,
+)
+
+
+def is_cacheable(response):
+    """Архивы и ответы больше CACHE_MAX_RESPONSE_SIZE не кешируются."""
+    content_type = response.headers.get('Content-Type', '')
+    if content_type.split(';')[0].strip().lower() in UNCACHED_CONTENT_TYPES:
+        return False
+    length = response.headers.get('Content-Length')
+    return not (length and int(length) > CACHE_MAX_RESPONSE_SIZE)
+
+
+class BoundedSQLiteDict(SQLiteDict):
+    """Таблица ответов с пределом размера и вытеснением по LRU.
+
+    Размер и время последнего обращения к записи хранятся в отдельной
+    таблице рядом с ответами. Когда сжатые ответы занимают больше
+    max_size байт, удаляются записи, к которым дольше всего не
+    обращались. max_size=None снимает предел.
+    """
+
+    def __init__(self, db_path, max_size=None, **kwargs):
+        self.max_size = max_size
+        super().__init__(db_path, **kwargs)
+
+    @property
+    def usage_table(self):
+        return f'{self.table_name}_usage'
+
+    def init_db(self):
+        super().init_db()
+        with self.connection(commit=True) as con:
+            con.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.usage_table} ('
+                '    key TEXT PRIMARY KEY,'
+                '    size INTEGER NOT NULL,'
+                '    accessed REAL NOT NULL'
+                ')'
+            )
+            con.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.usage_table}_accessed '
+                f'ON {self.usage_table} (accessed)'
+            )
+
+    def touch(self, con, key):
+        # Записи без строки использования появились до предела размера
+        con.execute(
+            f'INSERT OR REPLACE INTO {self.usage_table} (key, size, accessed) '
+            f'SELECT key, LENGTH(value), ? FROM {self.table_name} '
+            'WHERE key = ?',
+            (time.time(), key)
+        )
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        with self.connection(commit=True) as con:
+            self.touch(con, key)
+        return value
+
+    def _write(self, key, value):
+        super()._write(key, value)
+        with self.connection(commit=True) as con:
+            self.touch(con, key)
+        self.evict()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        with self.connection(commit=True) as con:
+            con.execute(
+                f'DELETE FROM {self.usage_table} WHERE key = ?', (key,)
+            )
+
+    def bulk_delete(self, keys=None, values=None):
+        super().bulk_delete(keys, values)
+        with self.connection(commit=True) as con:
+            con.execute(
+                f'DELETE FROM {self.usage_table} WHERE key NOT IN '
+                f'(SELECT key FROM {self.table_name})'
+            )
+
+    def clear(self):
+        with self._lock:
+            with self.connection(commit=True) as con:
+                con.execute(f'DROP TABLE IF EXISTS {self.usage_table}')
+            super().clear()
+
+    def total_size(self):
+        with self.connection() as con:
+            return con.execute(
+                f'SELECT COALESCE(SUM(size), 0) FROM {self.usage_table}'
+            ).fetchone()[0]
+
+    def evict(self):
+        if self.max_size is None:
+            return
+        with self._lock:
+            total = self.total_size()
+            if total <= self.max_size:
+                return
+            excess = total - self.max_size * EVICTION_TARGET
+            keys = []
+            with self.connection() as con:
+                for key, size in con.execute(
+                    f'SELECT key, size FROM {self.usage_table} '
+                    'ORDER BY accessed'
+                ):
+                    if excess <= 0:
+                        break
+                    keys.append(key)
+                    excess -= size
+            self.bulk_delete(keys)
+
+
+class BoundedSQLiteCache(SQLiteCache):
+    """SQLite-кеш со сжатыми ответами и пределом размера по LRU."""
+
+    def __init__(
+        self, db_path, max_size=None, serializer=compressed_serializer,
+        **kwargs
+    ):
+        super().__init__(db_path, serializer=serializer, **kwargs)
+        self.responses.close()
+        self.responses = BoundedSQLiteDict(
+            db_path, max_size=max_size, table_name='responses',
+            serializer=serializer, lock=self.redirects._lock, **kwargs
+        )
+
+
+class CountingCachedSession(CachedSession):
+    """Кеширующая сессия, которая считает попадания в кеш."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hits = 0
+        self.lookups = 0
+        self.stats_lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if not self.settings.disabled:
+            with self.stats_lock:
+                self.lookups += 1
+                self.hits += bool(getattr(response, 'from_cache', False))
+        return response
+
+    def cache_size(self):
+        responses = self.cache.responses
+        if hasattr(responses, 'total_size'):
+            return responses.total_size()
+        if hasattr(responses, 'size'):
+            return responses.size()
+        return 0
+
+    def summary(self):
+        return CACHE_STATS_MESSAGE.format(
+            entries=len(self.cache.responses),
+            size=self.cache_size(),
+            hits=self.hits,
+            lookups=self.lookups,
+            hit_rate=self.hits / self.lookups if self.lookups else 0.0,
+        )
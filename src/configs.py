@@ -1,18 +1,81 @@
 import argparse
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+import queue
 
-from constants import OUTPUT_MODES, LOG_DIR, LOF_FILE
+from constants import (
+    CACHE_BACKENDS, DEFAULT_BACKOFF_FACTOR, DEFAULT_CACHE_BACKEND,
+    DEFAULT_CACHE_MAX_SIZE, DEFAULT_EXPIRE_AFTER, DEFAULT_HOST_RATE,
+    DEFAULT_PARSE_CHUNK_SIZE, DEFAULT_PEP_SAMPLE, DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_RETRIES, DEFAULT_SERVE_HOST, DEFAULT_SERVE_PORT, DEFAULT_WORKERS,
+    JSON_LOG_FORMAT, LOF_FILE, LOG_DIR, LOG_FORMATS, OUTPUT_MODES,
+    PEP_SNAPSHOT_MAX_AGE, TEXT_LOG_FORMAT
+)
+from http_cache import parse_expire_pattern
+from log_handlers import (
+    JsonFormatter, LocalQueueHandler, RepeatedErrorFilter
+)
 
 
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
+POSITIVE_INT_ERROR_MESSAGE = 'Ожидалось положительное целое число: {value}'
+POSITIVE_FLOAT_ERROR_MESSAGE = 'Ожидалось положительное число: {value}'
+CACHE_SIZE_ERROR_MESSAGE = 'Ожидалось неотрицательное число мегабайт: {value}'
+SAMPLE_ERROR_MESSAGE = 'Ожидалось число PEP или процент от 0 до 100: {value}'
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            POSITIVE_INT_ERROR_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def positive_float(value):
+    number = float(value)
+    if not number > 0 or number == float('inf'):
+        raise argparse.ArgumentTypeError(
+            POSITIVE_FLOAT_ERROR_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def cache_size(value):
+    megabytes = int(value)
+    if megabytes < 0:
+        raise argparse.ArgumentTypeError(
+            CACHE_SIZE_ERROR_MESSAGE.format(value=value)
+        )
+    return megabytes * 1024 * 1024 or None
+
+
+def sample_size(value):
+    if value.endswith('%'):
+        percent = float(value[:-1])
+        if not 0 < percent <= 100:
+            raise argparse.ArgumentTypeError(
+                SAMPLE_ERROR_MESSAGE.format(value=value)
+            )
+        return percent
+    return positive_int(value)
+
+
+def expire_pattern(value):
+    try:
+        return parse_expire_pattern(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
 
 
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера'
     )
@@ -22,23 +85,195 @@ def configure_argument_parser(available_modes):
         action='store_true',
         help='Очистка кеша'
     )
+    parser.add_argument(
+        '--cache-backend',
+        choices=CACHE_BACKENDS,
+        default=DEFAULT_CACHE_BACKEND,
+        help='Хранилище HTTP-кеша'
+    )
+    parser.add_argument(
+        '--cache-path',
+        type=Path,
+        help='Путь к файлу или директории HTTP-кеша'
+    )
+    parser.add_argument(
+        '--cache-max-size',
+        type=cache_size,
+        default=DEFAULT_CACHE_MAX_SIZE,
+        metavar='MB',
+        help='Предел размера SQLite-кеша в мегабайтах (0 — без предела)'
+    )
+    parser.add_argument(
+        '--expire-after',
+        type=int,
+        default=DEFAULT_EXPIRE_AFTER,
+        help='Время хранения страниц в кеше, секунд (-1 — бессрочно)'
+    )
+    parser.add_argument(
+        '--expire',
+        type=expire_pattern,
+        action='append',
+        default=[],
+        metavar='PATTERN=SECONDS',
+        help='Время хранения в кеше для ссылок по шаблону'
+    )
+    parser.add_argument(
+        '--no-extraction-cache',
+        action='store_true',
+        help='Не использовать кеш извлечённых со страниц данных'
+    )
     parser.add_argument(
         '-o',
         '--output',
         choices=OUTPUT_MODES,
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help='Количество параллельных загрузок страниц'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        type=positive_int,
+        help='Разбирать страницы в пуле из стольких процессов'
+    )
+    parser.add_argument(
+        '--parse-chunk-size',
+        type=positive_int,
+        default=DEFAULT_PARSE_CHUNK_SIZE,
+        help='Сколько страниц отправлять в процесс разбора за раз'
+    )
+    parser.add_argument(
+        '--rate',
+        type=positive_float,
+        default=DEFAULT_HOST_RATE,
+        help='Не больше стольких запросов в секунду к одному сайту'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=DEFAULT_RETRIES,
+        help='Количество повторов запроса при ошибках'
+    )
+    parser.add_argument(
+        '--backoff',
+        type=float,
+        default=DEFAULT_BACKOFF_FACTOR,
+        help='Множитель экспоненциальной задержки между повторами, секунд'
+    )
+    parser.add_argument(
+        '-r',
+        '--resume',
+        action='store_true',
+        help='Продолжить прерванный обход с последней записи журнала'
+    )
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='Проверять только новые и изменившиеся PEP'
+    )
+    parser.add_argument(
+        '--max-age',
+        type=positive_int,
+        default=PEP_SNAPSHOT_MAX_AGE,
+        help='Через сколько секунд PEP проверяется заново в режиме -i'
+    )
+    parser.add_argument(
+        '-f',
+        '--fast',
+        action='store_true',
+        help='Считать статусы по таблице PEP 0, проверяя только выборку'
+    )
+    parser.add_argument(
+        '--sample',
+        type=sample_size,
+        default=DEFAULT_PEP_SAMPLE,
+        help='Размер выборки для --fast: число PEP или процент, например 5%%'
+    )
+    parser.add_argument(
+        '--all-formats',
+        action='store_true',
+        help=(
+            'В режиме download скачать все архивы документации '
+            'параллельно, по --workers загрузок, с манифестом SHA-256'
+        )
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Вывести время загрузки, разбора и поиска по страницам'
+    )
+    parser.add_argument(
+        '--profile-output',
+        type=Path,
+        help='Сохранить профиль cProfile основного потока в файл'
+    )
+    parser.add_argument(
+        '--metrics-output',
+        type=Path,
+        help=(
+            'Сохранить метрики запуска в файл: .json — в JSON, '
+            'иначе в текстовом формате Prometheus'
+        )
+    )
+    parser.add_argument(
+        '--log-format',
+        choices=LOG_FORMATS,
+        default=TEXT_LOG_FORMAT,
+        help='Формат записей лога'
+    )
+    parser.add_argument(
+        '--host',
+        default=DEFAULT_SERVE_HOST,
+        help='Адрес, на котором режим serve принимает запросы'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help='Порт, на котором режим serve принимает запросы'
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        help='Принимать запросы режима serve через Unix-сокет'
+    )
+    parser.add_argument(
+        '--refresh-interval',
+        type=positive_int,
+        default=DEFAULT_REFRESH_INTERVAL,
+        help='Как часто режим serve обновляет результаты, секунд'
+    )
     return parser
 
 
-def configure_logging():
+def configure_logging(log_format=TEXT_LOG_FORMAT):
+    """Настраивает лог через очередь.
+
+    Вызов logging только кладёт запись в очередь, а форматирование,
+    запись в файл с ротацией и вывод в консоль выполняет поток
+    QueueListener. Возвращает запущенный QueueListener, который нужно
+    остановить в конце работы, чтобы дописать оставшиеся записи.
+    """
     LOG_DIR.mkdir(exist_ok=True)
     rotating_handler = RotatingFileHandler(
         LOF_FILE, maxBytes=10 ** 6, backupCount=5
     )
-    logging.basicConfig(
-        datefmt=DT_FORMAT,
-        format=LOG_FORMAT,
-        level=logging.INFO,
-        handlers=(rotating_handler, logging.StreamHandler())
-    )
+    if log_format == JSON_LOG_FORMAT:
+        formatter = JsonFormatter(datefmt=DT_FORMAT)
+    else:
+        formatter = logging.Formatter(LOG_FORMAT, DT_FORMAT)
+    handlers = (rotating_handler, logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    queue_handler.addFilter(RepeatedErrorFilter())
+    logging.basicConfig(level=logging.INFO, handlers=(queue_handler,))
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    return listener
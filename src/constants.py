@@ -4,18 +4,90 @@ from pathlib import Path
 # Урлы
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_URL = 'https://peps.python.org/'
+# Сайты, где путь без слеша в конце перенаправляется на путь со слешем
+TRAILING_SLASH_HOSTS = ('docs.python.org', 'peps.python.org', 'www.python.org')
 
 # Директории
 BASE_DIR = Path(__file__).parent
 DOWNLOADS_DIR = BASE_DIR / 'downloads'
 LOG_DIR = BASE_DIR / 'logs'
 LOF_FILE = LOG_DIR / 'parser.log'
+CACHE_DIR = BASE_DIR / 'cache'
+EXTRACTION_CACHE_FILE = CACHE_DIR / 'extractions.sqlite'
+PEP_SNAPSHOT_FILE = CACHE_DIR / 'pep_snapshot.json'
+JOURNAL_DIR = CACHE_DIR / 'journals'
+PEP_DETAILS_DB_FILE = BASE_DIR / 'results' / 'peps.sqlite'
 
 # Настройки
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+TEXT_LOG_FORMAT = 'text'
+JSON_LOG_FORMAT = 'json'
+LOG_FORMATS = (TEXT_LOG_FORMAT, JSON_LOG_FORMAT)
+# Одна и та же ошибка по ссылке пишется в лог не чаще, секунд
+ERROR_REPEAT_INTERVAL = 60
 PRETTY_TABLE_OUTPUT = 'pretty'
 FILE_OUTPUT = 'file'
-OUTPUT_MODES = (PRETTY_TABLE_OUTPUT, FILE_OUTPUT)
+SQLITE_OUTPUT = 'sqlite'
+JSONL_OUTPUT = 'jsonl'
+OUTPUT_MODES = (
+    PRETTY_TABLE_OUTPUT, FILE_OUTPUT, SQLITE_OUTPUT, JSONL_OUTPUT
+)
+RESULTS_DB_NAME = 'results.sqlite'
+SQLITE_BATCH_SIZE = 500
+# Номер колонки со статусом в строках режима, индексируется в базе
+STATUS_COLUMNS = {'pep': 0, 'latest-versions': 2, 'pep-details': 2}
+DEFAULT_WORKERS = 1
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PEP_SNAPSHOT_MAX_AGE = 7 * 24 * 60 * 60
+# Сколько PEP проверять в режиме --fast: число или процент (float)
+DEFAULT_PEP_SAMPLE = 30
+DEFAULT_PARSE_CHUNK_SIZE = 8
+PARSE_FLUSH_TIMEOUT = 0.05
+# Границы гистограммы времени запросов, секунд
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Запуск всех режимов за один вызов
+ALL_MODES = 'all'
+PEP_DETAILS_MODE = 'pep-details'
+
+# Настройки режима serve
+SERVE_MODE = 'serve'
+SERVED_MODES = ('whats-new', 'latest-versions', 'pep')
+DEFAULT_SERVE_HOST = '127.0.0.1'
+DEFAULT_SERVE_PORT = 8000
+DEFAULT_REFRESH_INTERVAL = 60 * 60
+
+# Настройки HTTP-соединений
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Настройки планировщика запросов
+DEFAULT_HOST_RATE = 10.0
+INITIAL_HOST_CONCURRENCY = 2
+LATENCY_SLOWDOWN_FACTOR = 2.0
+THROTTLE_STATUSES = (429, 503)
+INDEX_PRIORITY = 0
+LEAF_PRIORITY = 1
+
+# Настройки HTTP-кеша, время хранения в секундах (-1 — бессрочно)
+CACHE_BACKENDS = ('sqlite', 'filesystem', 'memory')
+DEFAULT_CACHE_BACKEND = 'sqlite'
+DEFAULT_EXPIRE_AFTER = 24 * 60 * 60
+# Размеры в байтах
+DEFAULT_CACHE_MAX_SIZE = 200 * 1024 * 1024
+CACHE_MAX_RESPONSE_SIZE = 5 * 1024 * 1024
+UNCACHED_CONTENT_TYPES = (
+    'application/zip', 'application/pdf', 'application/gzip',
+    'application/x-tar', 'application/x-bzip2', 'application/x-xz',
+    'application/octet-stream',
+)
+URLS_EXPIRE_AFTER = {
+    'peps.python.org/pep-*': 7 * 24 * 60 * 60,
+    'peps.python.org': 60 * 60,
+    'docs.python.org/3/whatsnew/3.*': 7 * 24 * 60 * 60,
+}
 
 # Константы для расчетов
 EXPECTED_STATUS = {
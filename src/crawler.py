@@ -0,0 +1,69 @@
+from constants import DEFAULT_WORKERS
+
+
+def fetch_or_error(extract, session, url):
+    try:
+        return extract(session, url)
+    except ConnectionError as error:
+        return error
+
+
+def iter_crawl_threads(session, urls, extract, workers):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from tqdm import tqdm
+
+    with ThreadPoolExecutor(max_workers=workers) as executor, tqdm(
+        total=len(urls)
+    ) as progress:
+        futures = []
+        for url in urls:
+            future = executor.submit(fetch_or_error, extract, session, url)
+            future.add_done_callback(lambda _: progress.update())
+            futures.append(future)
+        try:
+            for url, future in zip(urls, futures):
+                yield url, future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def iter_journaled(urls, done, crawled, journal):
+    try:
+        for url in urls:
+            if url in done:
+                yield url, done[url]
+                continue
+            url, result = next(crawled)
+            journal.record(url, result)
+            yield url, result
+    finally:
+        crawled.close()
+
+
+def iter_crawl(
+    session, urls, extract, workers=DEFAULT_WORKERS, journal=None
+):
+    """Обходит страницы пулом из workers потоков.
+
+    Пары (ссылка, результат) отдаются в порядке urls, как только
+    готовы все предыдущие, независимо от того, в каком порядке
+    завершились загрузки. Ошибка загрузки страницы отдаётся вместо
+    результата, остальные исключения пробрасываются. С journal каждый
+    результат записывается в журнал, а уже записанные в нём ссылки
+    не загружаются.
+    """
+    urls = list(urls)
+    done = {} if journal is None else journal.entries
+    pending = [url for url in urls if url not in done]
+    crawled = iter_crawl_threads(session, pending, extract, workers)
+    if journal is None:
+        return crawled
+    return iter_journaled(urls, done, crawled, journal)
+
+
+def crawl(
+    session, urls, extract, workers=DEFAULT_WORKERS, journal=None
+):
+    return list(iter_crawl(session, urls, extract, workers, journal))
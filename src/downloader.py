@@ -0,0 +1,238 @@
+from contextlib import nullcontext
+import hashlib
+import json
+import os
+import threading
+import time
+
+from constants import DOWNLOAD_CHUNK_SIZE
+from profiling import profiled
+
+
+DOWNLOAD_ERROR_MESSAGE = 'Возникла ошибка при загрузке файла {url}'
+ETAG_SUFFIX = '.etag'
+PART_SUFFIX = '.part'
+LINK_SUFFIX = '.link'
+MANIFEST_NAME = 'manifest.json'
+
+
+def read_etag(path):
+    etag_path = path.with_name(path.name + ETAG_SUFFIX)
+    if etag_path.exists():
+        return etag_path.read_text(encoding='utf-8')
+    return None
+
+
+def write_etag(path, etag):
+    etag_path = path.with_name(path.name + ETAG_SUFFIX)
+    if etag:
+        etag_path.write_text(etag, encoding='utf-8')
+    elif etag_path.exists():
+        etag_path.unlink()
+
+
+def is_up_to_date(path, size, etag):
+    """Сравнивает локальный файл с сервером по ETag, а если ETag нет
+    у одной из сторон — по размеру."""
+    if not path.exists():
+        return False
+    local_etag = read_etag(path)
+    if etag is not None and local_etag is not None:
+        return etag == local_etag
+    return size is not None and path.stat().st_size == int(size)
+
+
+def write_part(response, part_path, etag, chunk_size):
+    if response.status_code == 206:
+        mode = 'ab'
+    else:
+        mode = 'wb'
+        write_etag(part_path, etag)
+    transferred = 0
+    with open(part_path, mode) as file:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            file.write(chunk)
+            transferred += len(chunk)
+    return transferred
+
+
+def finish_part(part_path, path, etag):
+    os.replace(part_path, path)
+    write_etag(part_path, None)
+    write_etag(path, etag)
+
+
+def stream_to_file(session, url, path, size, etag, chunk_size):
+    part_path = path.with_name(path.name + PART_SUFFIX)
+    part_etag = read_etag(part_path)
+    headers = {}
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    # Без ETag версии, с которой начат .part, нельзя убедиться, что
+    # докачивается тот же файл, поэтому загрузка начинается заново
+    if offset and part_etag:
+        if part_etag == etag and size is not None and offset == int(size):
+            # .part докачан целиком, но процесс завершился
+            # до переименования
+            finish_part(part_path, path, etag)
+            return 0
+        headers['Range'] = f'bytes={offset}-'
+        headers['If-Range'] = part_etag
+    with session.get(url, headers=headers, stream=True) as response:
+        if headers and response.status_code == 416:
+            transferred = None
+        else:
+            response.raise_for_status()
+            etag = response.headers.get('ETag', etag)
+            transferred = write_part(response, part_path, etag, chunk_size)
+    if transferred is None:
+        # Сервер не может продолжить .part с этого места: он не короче
+        # файла на сервере, поэтому загрузка начинается заново
+        part_path.unlink()
+        write_etag(part_path, None)
+        return stream_to_file(session, url, path, size, etag, chunk_size)
+    finish_part(part_path, path, etag)
+    return transferred
+
+
+@profiled('fetch', url_arg=1)
+def download_file(session, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """Потоково скачивает файл мимо HTTP-кеша.
+
+    Данные пишутся во временный файл .part, который после завершения
+    атомарно переименовывается в path. Прерванная загрузка продолжается
+    Range-запросом с If-Range по ETag, сохранённому рядом с .part при её
+    начале, а уже докачанный .part сразу переименовывается. Локальный
+    файл не скачивается повторно, если совпадает с сервером по ETag,
+    а когда ETag нет у одной из сторон — по размеру. Возвращает
+    количество полученных байт и время загрузки в секундах.
+    """
+    from requests import RequestException
+
+    cache_disabled = getattr(session, 'cache_disabled', nullcontext)
+    started = time.monotonic()
+    try:
+        with cache_disabled():
+            head = session.head(url, allow_redirects=True)
+            etag = head.headers.get('ETag')
+            size = head.headers.get('Content-Length')
+            if is_up_to_date(path, size, etag):
+                return 0, time.monotonic() - started
+            transferred = stream_to_file(
+                session, url, path, size, etag, chunk_size
+            )
+    except RequestException:
+        raise ConnectionError(DOWNLOAD_ERROR_MESSAGE.format(url=url))
+    return transferred, time.monotonic() - started
+
+
+def file_digest(path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_sha256(path, entry=None):
+    """SHA-256 файла; хеш из записи манифеста берётся без чтения
+    файла, если размер и время изменения файла с тех пор не менялись."""
+    stat = path.stat()
+    if (
+        entry is not None
+        and entry['size'] == stat.st_size
+        and entry['mtime_ns'] == stat.st_mtime_ns
+    ):
+        return entry['sha256']
+    return file_digest(path)
+
+
+def describe_file(path, url, entry=None):
+    """Запись манифеста: размер и SHA-256 файла."""
+    stat = path.stat()
+    return {
+        'url': url,
+        'size': stat.st_size,
+        'sha256': get_sha256(path, entry),
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def is_intact(path, entry):
+    """Проверяет, что локальный файл совпадает с манифестом по размеру
+    и SHA-256."""
+    return (
+        path.exists()
+        and path.stat().st_size == entry['size']
+        and get_sha256(path, entry) == entry['sha256']
+    )
+
+
+def load_manifest(path):
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_manifest(path, manifest):
+    temp_path = path.with_name(path.name + PART_SUFFIX)
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+class ArchiveMirror:
+    """Каталог архивов с манифестом контрольных сумм.
+
+    Перед загрузкой файл сверяется с манифестом по размеру и SHA-256:
+    повреждённый или подменённый файл удаляется и скачивается заново.
+    Целый файл скачивается заново, если на сервере сменился ETag,
+    а когда ETag нет у сервера или у файла — если изменился размер.
+    Одинаковые по размеру и SHA-256 архивы хранятся одним файлом,
+    остальные имена становятся жёсткими ссылками на него.
+    """
+
+    def __init__(self, directory, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.manifest_path = directory / MANIFEST_NAME
+        self.manifest = load_manifest(self.manifest_path)
+        self.lock = threading.Lock()
+
+    def download(self, session, url):
+        """Скачивает архив; возвращает путь и количество полученных байт."""
+        path = self.directory / url.split('/')[-1]
+        with self.lock:
+            entry = self.manifest.get(path.name)
+        if entry is not None and path.exists() and not is_intact(
+            path, entry
+        ):
+            path.unlink()
+        transferred, _ = download_file(session, url, path, self.chunk_size)
+        entry = describe_file(path, url, None if transferred else entry)
+        with self.lock:
+            self.manifest[path.name] = entry
+            self.deduplicate(path, entry)
+        return path, transferred
+
+    def deduplicate(self, path, entry):
+        for name, other in self.manifest.items():
+            other_path = self.directory / name
+            if (
+                name == path.name
+                or (other['size'], other['sha256'])
+                != (entry['size'], entry['sha256'])
+                or not other_path.exists()
+            ):
+                continue
+            if not os.path.samefile(other_path, path):
+                temp_path = path.with_name(path.name + LINK_SUFFIX)
+                os.link(other_path, temp_path)
+                os.replace(temp_path, path)
+                entry['mtime_ns'] = path.stat().st_mtime_ns
+            return
+
+    def save(self):
+        with self.lock:
+            save_manifest(self.manifest_path, self.manifest)
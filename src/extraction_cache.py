@@ -0,0 +1,63 @@
+import json
+import sqlite3
+import threading
+
+
+CREATE_TABLE_SQL = (
+    'CREATE TABLE IF NOT EXISTS extractions ('
+    'extractor TEXT NOT NULL, '
+    'url TEXT NOT NULL, '
+    'key TEXT NOT NULL, '
+    'value TEXT NOT NULL, '
+    'PRIMARY KEY (extractor, url))'
+)
+SELECT_SQL = (
+    'SELECT value FROM extractions '
+    'WHERE extractor = ? AND url = ? AND key = ?'
+)
+UPSERT_SQL = (
+    'INSERT OR REPLACE INTO extractions (extractor, url, key, value) '
+    'VALUES (?, ?, ?, ?)'
+)
+
+
+class ExtractionCache:
+    """Кеш значений, извлечённых со страниц.
+
+    Значение хранится по имени извлекающей функции и ссылке вместе
+    с ключом ответа (ETag или хеш тела) и отдаётся, только пока ключ
+    совпадает. Без path кеш живёт в памяти.
+    """
+
+    def __init__(self, path=None):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(
+            ':memory:' if path is None else str(path),
+            check_same_thread=False
+        )
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(CREATE_TABLE_SQL)
+
+    def get(self, extractor, url, key):
+        with self.lock:
+            row = self.connection.execute(
+                SELECT_SQL, (extractor, url, key)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, extractor, url, key, value):
+        with self.lock, self.connection:
+            self.connection.execute(
+                UPSERT_SQL,
+                (extractor, url, key, json.dumps(value, ensure_ascii=False))
+            )
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM extractions')
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,48 @@
+from profiling import profiled
+from utils import find_tag, get_strainer, parse_html
+
+
+# Разбираются только теги, из которых режимы берут данные
+PEP_PAGE_TAGS = ('dl',)
+WHATS_NEW_PAGE_TAGS = ('h1', 'dl')
+PEP_DETAILS_PAGE_TAGS = ('h1', 'dl')
+
+
+@profiled('extract')
+def extract_whats_new_page(html):
+    soup = parse_html(html, get_strainer(WHATS_NEW_PAGE_TAGS))
+    return (
+        find_tag(soup, 'h1').text,
+        find_tag(soup, 'dl').text.replace('\n', ' ')
+    )
+
+
+@profiled('extract')
+def extract_pep_status(html):
+    status_tag = parse_html(
+        html, get_strainer(PEP_PAGE_TAGS)
+    ).find(string='Status')
+    return status_tag.find_next('abbr').text
+
+
+def get_field_text(tag):
+    return ' '.join(tag.get_text().split())
+
+
+@profiled('extract')
+def extract_pep_details(html):
+    """Возвращает заголовок PEP и все поля его шапки по именам."""
+    soup = parse_html(html, get_strainer(PEP_DETAILS_PAGE_TAGS))
+    header = soup.find('dl', attrs={'class': 'rfc2822'}) or find_tag(
+        soup, 'dl'
+    )
+    title = soup.find('h1')
+    return (
+        '' if title is None else get_field_text(title),
+        {
+            get_field_text(name).rstrip(':'): get_field_text(
+                name.find_next_sibling('dd')
+            )
+            for name in header.find_all('dt', recursive=False)
+        }
+    )
@@ -0,0 +1,78 @@
+from functools import partial
+import threading
+
+from constants import DEFAULT_WORKERS, INDEX_PRIORITY
+from crawler import crawl
+from utils import canonical_url, get_response
+
+
+PLAN_SUMMARY_MESSAGE = (
+    'Общий план загрузки: {planned} страниц вместо {requested}, '
+    'загружено {fetched}, отдано режимам из памяти {reused} раз'
+)
+
+
+class PlannedSession:
+    """Сессия, отдающая заранее загруженные страницы плана из памяти.
+
+    Страницы плана хранятся по каноническим ссылкам, которые
+    запрашивает get_response. Из плана берутся только простые GET
+    без параметров; остальные запросы и атрибуты уходят в исходную
+    сессию.
+    """
+
+    def __init__(self, session, responses, planned=0, requested=0):
+        self.session = session
+        self.responses = responses
+        self.planned = planned
+        self.requested = requested
+        self.reused = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        response = None if kwargs else self.responses.get(url)
+        if response is None:
+            return self.session.get(url, **kwargs)
+        with self.lock:
+            self.reused += 1
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def summary(self):
+        return PLAN_SUMMARY_MESSAGE.format(
+            planned=self.planned, requested=self.requested,
+            fetched=len(self.responses), reused=self.reused
+        )
+
+
+def plan_urls(modes, mode_urls):
+    """Объединяет страницы, с которых начинают режимы, без повторов."""
+    return list(dict.fromkeys(
+        url for mode in modes for url in mode_urls.get(mode, ())
+    ))
+
+
+def prefetch(session, modes, mode_urls, workers=DEFAULT_WORKERS):
+    """Параллельно загружает общий план и возвращает PlannedSession.
+
+    Страницы, которые не удалось загрузить, в план не попадают: режим
+    запросит их сам и обработает ошибку как обычно.
+    """
+    urls = plan_urls(modes, mode_urls)
+    responses = {
+        canonical_url(url): response
+        for url, response in crawl(
+            session, urls,
+            partial(get_response, priority=INDEX_PRIORITY),
+            workers
+        )
+        if not isinstance(response, ConnectionError)
+    }
+    for response in responses.values():
+        response.from_plan = True
+    return PlannedSession(
+        session, responses, planned=len(urls),
+        requested=sum(len(mode_urls.get(mode, ())) for mode in modes)
+    )
@@ -0,0 +1,69 @@
+from constants import (
+    CACHE_DIR, DEFAULT_CACHE_BACKEND, DEFAULT_CACHE_MAX_SIZE,
+    DEFAULT_EXPIRE_AFTER, URLS_EXPIRE_AFTER
+)
+
+
+EXPIRE_PATTERN_ERROR_MESSAGE = (
+    'Ожидалось правило вида <шаблон ссылки>=<секунды>: {value}'
+)
+
+
+def parse_expire_pattern(value):
+    pattern, separator, seconds = value.rpartition('=')
+    if not separator or not pattern or not seconds.lstrip('-').isdigit():
+        raise ValueError(EXPIRE_PATTERN_ERROR_MESSAGE.format(value=value))
+    return pattern, int(seconds)
+
+
+def merge_expire_patterns(expire_patterns):
+    """Правила пользователя идут первыми и заменяют встроенные
+    правила с тем же шаблоном."""
+    user_patterns = dict(expire_patterns)
+    return {
+        **user_patterns,
+        **{
+            pattern: expire_after
+            for pattern, expire_after in URLS_EXPIRE_AFTER.items()
+            if pattern not in user_patterns
+        },
+    }
+
+
+def create_session(
+    backend=DEFAULT_CACHE_BACKEND,
+    cache_path=None,
+    expire_after=DEFAULT_EXPIRE_AFTER,
+    expire_patterns=(),
+    max_size=DEFAULT_CACHE_MAX_SIZE,
+):
+    """Создаёт кеширующую сессию.
+
+    Правила из expire_patterns проверяются раньше URLS_EXPIRE_AFTER
+    и заменяют встроенные правила с тем же шаблоном.
+    Устаревшие страницы с ETag или Last-Modified перепроверяются
+    условным запросом, поэтому неизменившаяся страница обходится
+    ответом 304 без тела. Ответы хранятся сжатыми, архивы и большие
+    файлы не кешируются, а SQLite-кеш больше max_size байт вытесняет
+    давно не использованные страницы.
+    """
+    from cache_storage import (
+        BoundedSQLiteCache, CountingCachedSession, compressed_serializer,
+        is_cacheable
+    )
+
+    if cache_path is None:
+        cache_path = CACHE_DIR / 'http_cache'
+    options = {'cache_name': str(cache_path)}
+    if backend == 'sqlite':
+        backend = BoundedSQLiteCache(options.pop('cache_name'), max_size)
+    elif backend != 'memory':
+        options['serializer'] = compressed_serializer
+    return CountingCachedSession(
+        backend=backend,
+        filter_fn=is_cacheable,
+        expire_after=expire_after,
+        urls_expire_after=merge_expire_patterns(expire_patterns),
+        stale_if_error=True,
+        **options
+    )
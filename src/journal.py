@@ -0,0 +1,53 @@
+import json
+
+
+class Journal:
+    """Журнал обхода: готовые ссылки, извлечённые значения и ошибки.
+
+    Каждый результат дописывается в файл JSON Lines сразу после
+    получения. С resume=True записи прошлого прерванного запуска
+    загружаются в entries и не запрашиваются повторно; оборванная
+    при падении последняя строка отбрасывается. Ссылки с ошибкой
+    загрузки при возобновлении запрашиваются заново: сбой мог быть
+    временным.
+    """
+
+    def __init__(self, path, resume=False):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.entries = self.load(path) if resume else {}
+        self.file = open(path, 'w', encoding='utf-8')
+        for url, result in self.entries.items():
+            self.record(url, result)
+
+    @staticmethod
+    def load(path):
+        entries = {}
+        if not path.exists():
+            return entries
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if 'error' in record:
+                    entries.pop(record['url'], None)
+                else:
+                    entries[record['url']] = record['value']
+        return entries
+
+    def record(self, url, result):
+        if isinstance(result, Exception):
+            record = {'url': url, 'error': str(result)}
+        else:
+            record = {'url': url, 'value': result}
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def complete(self):
+        self.close()
+        self.path.unlink(missing_ok=True)
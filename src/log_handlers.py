@@ -0,0 +1,73 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+import threading
+import time
+
+from constants import ERROR_REPEAT_INTERVAL
+
+
+SUPPRESSED_SUFFIX = ' (повторов подавлено: {count})'
+
+
+class LocalQueueHandler(QueueHandler):
+    """Передаёт записи в очередь без форматирования.
+
+    Очередь не покидает процесс, поэтому записи не нужно готовить
+    к pickle: сообщение и трассировку форматирует поток QueueListener,
+    а не поток, который пишет в лог.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись лога — один JSON-объект в строке."""
+
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        url = getattr(record, 'url', None)
+        if url is not None:
+            data['url'] = url
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data['stack'] = record.stack_info
+        return json.dumps(data, ensure_ascii=False)
+
+
+class RepeatedErrorFilter(logging.Filter):
+    """Пропускает одну ошибку по ссылке за interval секунд.
+
+    Ключ — поле url записи (extra={'url': ...}), а без него — текст
+    сообщения. Число подавленных повторов дописывается к следующей
+    пропущенной записи с тем же ключом.
+    """
+
+    def __init__(self, interval=ERROR_REPEAT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.ERROR:
+            return True
+        key = getattr(record, 'url', None) or record.msg
+        now = time.monotonic()
+        with self.lock:
+            last, suppressed = self.seen.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self.seen[key] = (last, suppressed + 1)
+                return False
+            self.seen[key] = (now, 0)
+        if suppressed:
+            record.msg = str(record.msg) + SUPPRESSED_SUFFIX.format(
+                count=suppressed
+            )
+        return True
@@ -1,23 +1,72 @@
+from argparse import Namespace
 from collections import defaultdict
+from contextlib import nullcontext
+from functools import partial
 import logging
+import math
+import random
 import re
+import time
 from urllib.parse import urljoin
 
-import requests_cache
-from tqdm import tqdm
-
-from constants import EXPECTED_STATUS, MAIN_DOC_URL, PEP_URL, BASE_DIR
+from constants import (
+    ALL_MODES, BASE_DIR, DEFAULT_PEP_SAMPLE, DEFAULT_WORKERS, EXPECTED_STATUS,
+    EXTRACTION_CACHE_FILE, JOURNAL_DIR, MAIN_DOC_URL, PEP_DETAILS_DB_FILE,
+    PEP_DETAILS_MODE, PEP_SNAPSHOT_FILE, PEP_SNAPSHOT_MAX_AGE, PEP_URL,
+    SERVE_MODE, SERVED_MODES
+)
 from configs import configure_argument_parser, configure_logging
-from outputs import control_output
-from utils import find_tag, get_soup
+from crawler import crawl, iter_crawl
+from downloader import ArchiveMirror, download_file
+from extraction_cache import ExtractionCache
+from extractors import (
+    extract_pep_details, extract_pep_status, extract_whats_new_page
+)
+from fetch_plan import prefetch
+from http_cache import create_session
+from journal import Journal
+from metrics import (
+    DOWNLOADED_BYTES, METRICS_SAVED_MESSAGE, MODE_DURATION, MODE_FAILURES,
+    PEP_STATUS_MISMATCHES, registry
+)
+from outputs import control_output, streamable
+from pep_store import PepStore, get_authors, get_pep_number
+from profiling import profile_run
+from scheduler import Scheduler
+from snapshot import (
+    get_outdated_links, load_snapshot, save_snapshot, update_snapshot
+)
+from utils import find_tag, flights, get_extracted, get_soup
 
 
+WHATS_NEW_URL = urljoin(MAIN_DOC_URL, 'whatsnew/')
+DOWNLOADS_URL = urljoin(MAIN_DOC_URL, 'download.html')
 COMMAND_ARGS_INFO_MESSAGE = 'Аргументы командной строки: {args}'
 DOWNLOAD_INFO_MESSAGE = 'Архив был загружен и сохранён: {archive_path}'
+DOWNLOAD_SPEED_MESSAGE = (
+    'Получено {transferred} байт, скорость загрузки {speed:.0f} байт/с'
+)
+DOWNLOAD_SKIPPED_MESSAGE = (
+    'Архив уже актуален, загрузка пропущена: {archive_path}'
+)
+ALL_FORMATS_INFO_MESSAGE = (
+    'Архивы документации: скачано {downloaded} из {total}, получено '
+    '{transferred} байт за {elapsed:.1f} с, манифест {manifest_path}'
+)
+DOWNLOAD_TABLE_LINKS = 'div[role="main"] table.docutils a[href]'
+SERVE_MODES_ERROR_MESSAGE = 'Режим serve запускается отдельно от других'
 PARSER_START_MESSAGE = 'Парсер запущен!'
 PARSER_FINISH_MESSAGE = 'Парсер завершил работу.'
 ERROR_MESSAGE = 'Произошла ошибка в работе парсера: {error}'
 REQUEST_ERROR_MESSAGE = 'Возникла ошибка при загрузке страницы {url}'
+PEP_CHECK_INFO_MESSAGE = 'Проверяется PEP: {checked} из {total}'
+PEP_SAMPLE_INFO_MESSAGE = (
+    'Проверено PEP: {checked} из {total}, несовпадений статусов '
+    '{mismatches} ({rate:.1%}, 95% интервал {low:.1%}–{high:.1%})'
+)
+PEP_DETAILS_SAVED_MESSAGE = (
+    'Поля {count} PEP сохранены в базу {db_path}'
+)
 UNEXPECTED_PEP_STATUS_ERROR = (
     'Несовпадающие статусы '
     'ссылка: {pep_link} '
@@ -26,35 +75,41 @@ UNEXPECTED_PEP_STATUS_ERROR = (
 )
 
 
-def whats_new(session):
-    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, Автор')]
+@streamable
+def whats_new(
+    session, workers=DEFAULT_WORKERS,
+    extraction_cache=None, parse_pool=None, journal=None, **kwargs
+):
     errors = []
-    for section in tqdm(get_soup(
-        session, whats_new_url
-    ).select(
-        '#what-s-new-in-python div.toctree-wrapper li.toctree-l1'
-    )):
-        version_a_tag = find_tag(section, 'a')
-        version_link = urljoin(whats_new_url, version_a_tag['href'])
-        try:
-            soup = get_soup(session, version_link)
-        except ConnectionError:
-            errors.append(REQUEST_ERROR_MESSAGE.format(url=version_link))
-            continue
-        results.append(
-            (
-                version_link,
-                find_tag(soup, 'h1').text,
-                find_tag(soup, 'dl').text.replace('\n', ' ')
-            )
+    version_links = [
+        urljoin(WHATS_NEW_URL, find_tag(section, 'a')['href'])
+        for section in get_soup(session, WHATS_NEW_URL).select(
+            '#what-s-new-in-python div.toctree-wrapper li.toctree-l1'
         )
-    for error in errors:
-        logging.error(error, stack_info=True)
-    return results
+    ]
+    yield ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
+    for version_link, page in iter_crawl(
+        session, version_links,
+        partial(
+            get_extracted,
+            extract=extract_whats_new_page,
+            extraction_cache=extraction_cache,
+            parse_pool=parse_pool
+        ),
+        workers, journal
+    ):
+        if isinstance(page, ConnectionError):
+            errors.append((
+                version_link, REQUEST_ERROR_MESSAGE.format(url=version_link)
+            ))
+            continue
+        yield (version_link, *page)
+    for url, error in errors:
+        logging.error(error, extra={'url': url})
 
 
-def latest_versions(session):
+@streamable
+def latest_versions(session, **kwargs):
     for ul in find_tag(
         get_soup(session, MAIN_DOC_URL),
         'div',
@@ -67,7 +122,7 @@ def latest_versions(session):
             break
     else:
         raise NameError('Ничего не нашлось')
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, Автор')]
+    yield ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
     pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
     for a_tag in a_tags:
         text_match = re.search(pattern, a_tag.text)
@@ -75,72 +130,249 @@ def latest_versions(session):
             version, status = text_match.groups()
         else:
             version, status = a_tag.text, ''
-        results.append(
-            (a_tag['href'], version, status)
+        yield (a_tag['href'], version, status)
+
+
+def download_all_formats(session, downloads_dir, workers):
+    urls = list(dict.fromkeys(
+        urljoin(DOWNLOADS_URL, link['href'])
+        for link in get_soup(session, DOWNLOADS_URL).select(
+            DOWNLOAD_TABLE_LINKS
         )
-    return results
+    ))
+    mirror = ArchiveMirror(downloads_dir)
+    started = time.monotonic()
+    downloaded = transferred = 0
+    try:
+        for url, result in iter_crawl(
+            session, urls, mirror.download, workers
+        ):
+            if isinstance(result, ConnectionError):
+                logging.error(str(result), extra={'url': url})
+                continue
+            _, archive_transferred = result
+            downloaded += bool(archive_transferred)
+            transferred += archive_transferred
+    finally:
+        mirror.save()
+    DOWNLOADED_BYTES.inc(transferred)
+    logging.info(ALL_FORMATS_INFO_MESSAGE.format(
+        downloaded=downloaded, total=len(urls), transferred=transferred,
+        elapsed=time.monotonic() - started,
+        manifest_path=mirror.manifest_path
+    ))
 
 
-def download(session):
-    downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
-    pdf_a4_link = get_soup(session, downloads_url).select_one(
+def download(
+    session, all_formats=False, workers=DEFAULT_WORKERS, **kwargs
+):
+    if all_formats:
+        download_all_formats(session, BASE_DIR / 'downloads', workers)
+        return
+    pdf_a4_link = get_soup(session, DOWNLOADS_URL).select_one(
         'div[role="main"] table.docutils a[href*="pdf-a4.zip"]'
     )['href']
-    archive_url = urljoin(downloads_url, pdf_a4_link)
+    archive_url = urljoin(DOWNLOADS_URL, pdf_a4_link)
     filename = archive_url.split('/')[-1]
     downloads_dir = BASE_DIR / 'downloads'
     downloads_dir.mkdir(exist_ok=True)
     archive_path = downloads_dir / filename
-    response = session.get(archive_url)
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
+    transferred, elapsed = download_file(session, archive_url, archive_path)
+    if not transferred:
+        logging.info(
+            DOWNLOAD_SKIPPED_MESSAGE.format(archive_path=archive_path)
+        )
+        return
+    DOWNLOADED_BYTES.inc(transferred)
     logging.info(DOWNLOAD_INFO_MESSAGE.format(archive_path=archive_path))
+    logging.info(DOWNLOAD_SPEED_MESSAGE.format(
+        transferred=transferred, speed=transferred / max(elapsed, 1e-6)
+    ))
 
 
-def pep(session):
-    errors = []
-    statuses = defaultdict(int)
-    elements = []
-    for element in (get_soup(session, PEP_URL).find_all(
+def get_index_status(abbr):
+    if abbr is None:
+        return '', EXPECTED_STATUS[''][0]
+    letter = abbr.text[1:]
+    title = abbr.get('title')
+    if title:
+        return letter, title.split(', ')[-1]
+    return letter, EXPECTED_STATUS.get(letter, ('',))[0]
+
+
+def get_pep_rows(session):
+    rows = []
+    for table in get_soup(session, PEP_URL).find_all(
         'table', attrs={'class': 'pep-zero-table docutils align-default'}
-    )):
-        elements.extend(element.find_all('tr'))
-    for row in tqdm(elements):
-        status = row.find('abbr')
-        if status is not None:
-            table_status = status.text[1:]
-        else:
-            table_status = ''
-        a_tag = row.find('a')
-        if a_tag is not None:
-            pep_link = urljoin(PEP_URL, a_tag['href'])
-            try:
-                soup = get_soup(session, pep_link)
-            except ConnectionError:
-                errors.append(REQUEST_ERROR_MESSAGE.format(url=pep_link))
+    ):
+        for row in table.find_all('tr'):
+            a_tag = row.find('a')
+            if a_tag is None:
                 continue
-            status_tag = soup.find(string='Status')
-            page_status = status_tag.find_next('abbr').text
-        else:
+            rows.append((
+                urljoin(PEP_URL, a_tag['href']),
+                *get_index_status(row.find('abbr'))
+            ))
+    return rows
+
+
+def get_sample_size(sample, total):
+    if isinstance(sample, float):
+        return min(total, math.ceil(total * sample / 100))
+    return min(total, sample)
+
+
+def wilson_interval(hits, total, z=1.96):
+    if not total:
+        return 0.0, 1.0
+    share = hits / total
+    center = share + z ** 2 / (2 * total)
+    margin = z * math.sqrt(
+        share * (1 - share) / total + z ** 2 / (4 * total ** 2)
+    )
+    scale = 1 + z ** 2 / total
+    return (
+        max(0.0, (center - margin) / scale),
+        min(1.0, (center + margin) / scale)
+    )
+
+
+def pep_fast(session, rows, sample, fetch, workers):
+    statuses = defaultdict(int)
+    for _, _, index_status in rows:
+        statuses[index_status] += 1
+    index_statuses = {link: status for link, _, status in rows}
+    links = random.sample(
+        list(index_statuses), get_sample_size(sample, len(index_statuses))
+    )
+    checked = mismatches = 0
+    for pep_link, page_status in iter_crawl(
+        session, links, fetch, workers
+    ):
+        if isinstance(page_status, ConnectionError):
+            logging.error(
+                REQUEST_ERROR_MESSAGE.format(url=pep_link),
+                extra={'url': pep_link}
+            )
+            continue
+        checked += 1
+        if page_status != index_statuses[pep_link]:
+            mismatches += 1
+            PEP_STATUS_MISMATCHES.inc(status=page_status)
+            logging.error(UNEXPECTED_PEP_STATUS_ERROR.format(
+                pep_link=pep_link,
+                page_status=page_status,
+                expected_status=index_statuses[pep_link]
+            ), extra={'url': pep_link})
+    low, high = wilson_interval(mismatches, checked)
+    logging.info(PEP_SAMPLE_INFO_MESSAGE.format(
+        checked=checked, total=len(index_statuses), mismatches=mismatches,
+        rate=mismatches / checked if checked else 0.0, low=low, high=high
+    ))
+    yield ('Статус', 'Количество')
+    yield from statuses.items()
+    yield ('Total', sum(statuses.values()))
+
+
+@streamable
+def pep(
+    session, workers=DEFAULT_WORKERS,
+    extraction_cache=None, parse_pool=None, journal=None,
+    incremental=False, max_age=PEP_SNAPSHOT_MAX_AGE, fast=False,
+    sample=DEFAULT_PEP_SAMPLE, **kwargs
+):
+    errors = []
+    statuses = defaultdict(int)
+    rows = get_pep_rows(session)
+    fetch = partial(
+        get_extracted,
+        extract=extract_pep_status,
+        extraction_cache=extraction_cache,
+        parse_pool=parse_pool
+    )
+    if fast:
+        yield from pep_fast(session, rows, sample, fetch, workers)
+        return
+    snapshot = load_snapshot(PEP_SNAPSHOT_FILE)
+    if incremental:
+        links = get_outdated_links(snapshot, rows, max_age)
+    else:
+        links = dict.fromkeys(link for link, _, _ in rows)
+    logging.info(PEP_CHECK_INFO_MESSAGE.format(
+        checked=len(links), total=len({link for link, _, _ in rows})
+    ))
+    fetched = crawl(session, links, fetch, workers, journal)
+    update_snapshot(snapshot, rows, fetched)
+    save_snapshot(PEP_SNAPSHOT_FILE, snapshot)
+    page_statuses = {
+        link: entry['page_status'] for link, entry in snapshot.items()
+    }
+    page_statuses.update(fetched)
+    for pep_link, table_status, _ in rows:
+        page_status = page_statuses[pep_link]
+        if isinstance(page_status, ConnectionError):
+            errors.append((
+                pep_link, REQUEST_ERROR_MESSAGE.format(url=pep_link)
+            ))
             continue
         expected_status = EXPECTED_STATUS.get(table_status)
         if page_status not in expected_status:
-            errors.append(
+            PEP_STATUS_MISMATCHES.inc(status=page_status)
+            errors.append((
+                pep_link,
                 UNEXPECTED_PEP_STATUS_ERROR.format(
                     pep_link=pep_link,
                     page_status=page_status,
                     expected_status=expected_status
                 )
-            )
+            ))
             continue
         statuses[page_status] += 1
-    for error in errors:
-        logging.error(error)
-    return [
-        ('Статус', 'Количество'),
-        *statuses.items(),
-        ('Total', sum(statuses.values())),
-    ]
+    for url, error in errors:
+        logging.error(error, extra={'url': url})
+    yield ('Статус', 'Количество')
+    yield from statuses.items()
+    yield ('Total', sum(statuses.values()))
+
+
+@streamable
+def pep_details(
+    session, workers=DEFAULT_WORKERS,
+    extraction_cache=None, parse_pool=None, journal=None, **kwargs
+):
+    links = dict.fromkeys(link for link, _, _ in get_pep_rows(session))
+    fetch = partial(
+        get_extracted,
+        extract=extract_pep_details,
+        extraction_cache=extraction_cache,
+        parse_pool=parse_pool
+    )
+    pages = []
+    yield ('PEP', 'Заголовок', 'Статус', 'Тип', 'Автор', 'Версия Python')
+    for pep_link, details in iter_crawl(
+        session, links, fetch, workers, journal
+    ):
+        if isinstance(details, ConnectionError):
+            logging.error(
+                REQUEST_ERROR_MESSAGE.format(url=pep_link),
+                extra={'url': pep_link}
+            )
+            continue
+        title, fields = details
+        pages.append((pep_link, (title, fields)))
+        yield (
+            get_pep_number(pep_link),
+            title,
+            fields.get('Status', ''),
+            fields.get('Type', ''),
+            ', '.join(get_authors(fields.get('Author', ''))),
+            fields.get('Python-Version', ''),
+        )
+    with PepStore(PEP_DETAILS_DB_FILE) as store:
+        store.save(pages)
+    logging.info(PEP_DETAILS_SAVED_MESSAGE.format(
+        count=len(pages), db_path=PEP_DETAILS_DB_FILE
+    ))
 
 
 MODE_TO_FUNCTION = {
@@ -149,25 +381,167 @@ MODE_TO_FUNCTION = {
     'download': download,
     'pep': pep,
 }
+# Страницы, с которых режим начинает обход, для общего плана загрузки
+MODE_INDEX_URLS = {
+    'whats-new': (WHATS_NEW_URL,),
+    'latest-versions': (MAIN_DOC_URL,),
+    'download': (DOWNLOADS_URL,),
+    'pep': (PEP_URL,),
+}
+# Режимы, которые запускаются только явно и не входят в all
+EXTRA_MODE_TO_FUNCTION = {PEP_DETAILS_MODE: pep_details}
+EXTRA_MODE_INDEX_URLS = {PEP_DETAILS_MODE: (PEP_URL,)}
+MODES = {**MODE_TO_FUNCTION, **EXTRA_MODE_TO_FUNCTION}
+
+
+def create_extraction_cache(args):
+    if args.no_extraction_cache:
+        return None
+    if args.cache_backend == 'memory':
+        return ExtractionCache()
+    return ExtractionCache(EXTRACTION_CACHE_FILE)
+
+
+def create_parse_pool(args):
+    if args.parse_workers is None:
+        return nullcontext()
+    from parse_pool import ParsePool
+
+    return ParsePool(
+        args.parse_workers, args.parse_chunk_size, callers=args.workers
+    )
+
+
+def clear_cache(session, extraction_cache):
+    session.cache.clear()
+    if extraction_cache is not None:
+        extraction_cache.clear()
+    PEP_SNAPSHOT_FILE.unlink(missing_ok=True)
+
+
+def run_mode(session, args, **options):
+    journal = Journal(JOURNAL_DIR / f'{args.mode}.jsonl', resume=args.resume)
+    results = MODES[args.mode](
+        session, journal=journal, stream=True, **options, **vars(args)
+    )
+    if results is not None:
+        control_output(results, args)
+    journal.complete()
+
+
+def get_modes(selected):
+    """Возвращает режимы без повторов; all раскрывается в основные
+    режимы, а остальные выбранные режимы идут после них по порядку."""
+    if ALL_MODES in selected:
+        selected = [*MODE_TO_FUNCTION, *selected]
+    return list(dict.fromkeys(
+        mode for mode in selected if mode != ALL_MODES
+    ))
+
+
+def run_modes(session, args, **options):
+    """Запускает выбранные режимы по очереди на одной сессии.
+
+    Для нескольких режимов их начальные страницы сначала загружаются
+    одним общим планом без повторов. Каждый режим выводит результаты
+    сам, и ошибка в одном режиме не останавливает остальные.
+    """
+    modes = get_modes(args.mode)
+    if len(modes) > 1:
+        session = prefetch(
+            session, modes, {**MODE_INDEX_URLS, **EXTRA_MODE_INDEX_URLS},
+            args.workers
+        )
+    for mode in modes:
+        started = time.monotonic()
+        try:
+            run_mode(
+                session, Namespace(**{**vars(args), 'mode': mode}),
+                **options
+            )
+        except Exception as e:
+            MODE_FAILURES.inc(mode=mode)
+            logging.exception(ERROR_MESSAGE.format(error=e))
+        MODE_DURATION.set(time.monotonic() - started, mode=mode)
+    if len(modes) > 1:
+        logging.info(session.summary())
+
+
+def run_server(session, args, **options):
+    from server import ResultStore, serve
+
+    options = {**vars(args), **options}
+    store = ResultStore(
+        session,
+        {mode: MODE_TO_FUNCTION[mode] for mode in SERVED_MODES},
+        **options
+    )
+    serve(store, args.host, args.port, args.socket, args.refresh_interval)
+
+
+def export_metrics(path):
+    if path is None:
+        return
+    try:
+        registry.export(path)
+    except OSError as e:
+        logging.exception(ERROR_MESSAGE.format(error=e))
+        return
+    logging.info(METRICS_SAVED_MESSAGE.format(path=path))
 
 
 def main():
+    arg_parser = configure_argument_parser(
+        (*MODES, ALL_MODES, SERVE_MODE)
+    )
+    args = arg_parser.parse_args()
+    if SERVE_MODE in args.mode and len(args.mode) > 1:
+        arg_parser.error(SERVE_MODES_ERROR_MESSAGE)
+    log_listener = configure_logging(args.log_format)
     try:
-        configure_logging()
         logging.info(PARSER_START_MESSAGE)
-        arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
-        args = arg_parser.parse_args()
         logging.info(COMMAND_ARGS_INFO_MESSAGE.format(args=args))
-        session = requests_cache.CachedSession()
+        # requests и urllib3 нужны только для запросов, поэтому не
+        # загружаются ради --help
+        from transport import mount_transport
+
+        session = create_session(
+            args.cache_backend,
+            args.cache_path,
+            args.expire_after,
+            args.expire,
+            args.cache_max_size,
+        )
+        adapter = mount_transport(
+            session, args.workers,
+            retries=args.retries, backoff_factor=args.backoff,
+            scheduler=Scheduler(args.rate, args.workers)
+        )
+        extraction_cache = create_extraction_cache(args)
         if args.clear_cache:
-            session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results is not None:
-            control_output(results, args)
+            clear_cache(session, extraction_cache)
+        with create_parse_pool(args) as parse_pool, profile_run(
+            args.profile, args.profile_output
+        ):
+            if args.mode == [SERVE_MODE]:
+                run_server(
+                    session, args, extraction_cache=extraction_cache,
+                    parse_pool=parse_pool
+                )
+            else:
+                run_modes(
+                    session, args, extraction_cache=extraction_cache,
+                    parse_pool=parse_pool
+                )
+        logging.info(adapter.summary())
+        logging.info(flights.summary())
+        logging.info(session.summary())
     except Exception as e:
         logging.exception(ERROR_MESSAGE.format(error=e))
-    logging.info(PARSER_FINISH_MESSAGE)
+    finally:
+        export_metrics(args.metrics_output)
+        logging.info(PARSER_FINISH_MESSAGE)
+        log_listener.stop()
 
 
 if __name__ == '__main__':
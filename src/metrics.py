@@ -0,0 +1,220 @@
+from bisect import bisect_left
+import json
+import math
+import os
+import threading
+from urllib.parse import urlsplit
+
+from constants import LATENCY_BUCKETS
+
+
+METRICS_SAVED_MESSAGE = 'Метрики сохранены: {path}'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace(
+            '"', r'\"'
+        ).replace('\n', r'\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def key(self, labels):
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, key)), value
+
+    def to_dict(self):
+        return {
+            'type': self.kind,
+            'help': self.documentation,
+            'samples': [
+                {'name': name, 'labels': labels, 'value': value}
+                for name, labels, value in self.samples()
+            ],
+        }
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self.key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=()):
+        super().__init__(name, documentation, labels)
+        self.buckets = (*sorted(buckets), math.inf)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with self.lock:
+            counts, total = self.values.get(
+                key, ([0] * len(self.buckets), 0.0)
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            self.values[key] = (counts, total + value)
+
+    def samples(self):
+        with self.lock:
+            values = {
+                key: (list(counts), total)
+                for key, (counts, total) in self.values.items()
+            }
+        for key, (counts, total) in sorted(values.items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket', {
+                    **labels, 'le': format_value(bound)
+                }, cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class Registry:
+    """Метрики запуска в памяти процесса.
+
+    Экспортируются в текстовом формате Prometheus (для textfile
+    collector и /metrics режима serve) или в JSON.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()):
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=()):
+        return self.register(
+            Histogram(name, documentation, labels, buckets)
+        )
+
+    def to_prometheus(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(
+                    f'{name}{format_labels(labels)} {format_value(value)}'
+                )
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        return json.dumps(
+            {name: metric.to_dict() for name, metric in self.metrics.items()},
+            ensure_ascii=False, indent=2
+        )
+
+    def export(self, path):
+        """Атомарно сохраняет метрики: JSON для .json, иначе Prometheus."""
+        text = self.to_json() if path.suffix == '.json' else (
+            self.to_prometheus()
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'{path.name}.tmp')
+        temp_path.write_text(text, encoding='utf-8')
+        os.replace(temp_path, path)
+
+
+registry = Registry()
+PAGES_FETCHED = registry.counter(
+    'parser_pages_fetched_total',
+    'Загружено страниц по сайтам и HTTP-статусам',
+    ('host', 'status')
+)
+CACHE_HITS = registry.counter(
+    'parser_cache_hits_total', 'Страниц отдано из HTTP-кеша', ('host',)
+)
+RESPONSE_BYTES = registry.counter(
+    'parser_response_bytes_total',
+    'Получено байт тел ответов из сети', ('host',)
+)
+REQUEST_ERRORS = registry.counter(
+    'parser_request_errors_total', 'Запросов с сетевой ошибкой', ('host',)
+)
+REQUEST_DURATION = registry.histogram(
+    'parser_request_duration_seconds',
+    'Время запросов к сайту мимо кеша, секунд', ('host',), LATENCY_BUCKETS
+)
+DOWNLOADED_BYTES = registry.counter(
+    'parser_downloaded_bytes_total', 'Скачано байт архивов'
+)
+PEP_STATUS_MISMATCHES = registry.counter(
+    'parser_pep_status_mismatches_total',
+    'PEP, статус в карточке которых не совпал с таблицей', ('status',)
+)
+MODE_FAILURES = registry.counter(
+    'parser_mode_failures_total', 'Запусков режима с ошибкой', ('mode',)
+)
+MODE_DURATION = registry.gauge(
+    'parser_mode_duration_seconds',
+    'Длительность последнего запуска режима, секунд', ('mode',)
+)
+
+
+def get_host(url):
+    return urlsplit(url).hostname or ''
+
+
+def record_response(url, response, elapsed):
+    # Страницы общего плана уже учтены при предварительной загрузке
+    if getattr(response, 'from_plan', False):
+        return
+    host = get_host(url)
+    PAGES_FETCHED.inc(host=host, status=response.status_code)
+    if getattr(response, 'from_cache', False):
+        CACHE_HITS.inc(host=host)
+        return
+    RESPONSE_BYTES.inc(len(response.content), host=host)
+    REQUEST_DURATION.observe(elapsed, host=host)
+
+
+def record_error(url):
+    REQUEST_ERRORS.inc(host=get_host(url))
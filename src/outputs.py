@@ -1,27 +1,75 @@
 import csv
 import datetime as dt
+from functools import wraps
+from itertools import islice
+import json
 import logging
-
-from prettytable import PrettyTable
+import sqlite3
 
 from constants import (
-    BASE_DIR, DATETIME_FORMAT, PRETTY_TABLE_OUTPUT, FILE_OUTPUT
+    BASE_DIR, DATETIME_FORMAT, FILE_OUTPUT, JSONL_OUTPUT,
+    PRETTY_TABLE_OUTPUT, RESULTS_DB_NAME, SQLITE_BATCH_SIZE, SQLITE_OUTPUT,
+    STATUS_COLUMNS
 )
 
 
 FILE_SAVED_MESSAGE = 'Файл с результатами был сохранён: {file_path}'
+DB_SAVED_MESSAGE = (
+    'Результаты запуска {run_id} сохранены в базу {db_path}: {count} строк'
+)
+CREATE_RESULTS_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    header TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    mode TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_mode_started ON runs (mode, started_at);
+CREATE INDEX IF NOT EXISTS rows_run ON rows (run_id);
+CREATE INDEX IF NOT EXISTS rows_mode_status ON rows (mode, status);
+"""
+INSERT_RUN_SQL = (
+    'INSERT INTO runs (mode, started_at, header) VALUES (?, ?, ?)'
+)
+INSERT_ROW_SQL = (
+    'INSERT INTO rows (run_id, mode, position, status, data) '
+    'VALUES (?, ?, ?, ?, ?)'
+)
+
+
+def streamable(mode):
+    """Превращает режим-генератор строк в функцию, возвращающую список.
+
+    С stream=True режим возвращает сам генератор, и вывод получает
+    строки по мере их появления.
+    """
+    @wraps(mode)
+    def wrapper(*args, stream=False, **kwargs):
+        rows = mode(*args, **kwargs)
+        return rows if stream else list(rows)
+    return wrapper
 
 
 def default_output(results, *args):
     for row in results:
-        print(*row)
+        print(*row, flush=True)
 
 
 def pretty_output(results, *args):
+    from prettytable import PrettyTable
+
+    header, *rows = results
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = header
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(rows)
     print(table)
 
 
@@ -34,17 +82,70 @@ def file_output(results, cli_args):
     file_name = f'{parser_mode}_{now_formatted}.csv'
     file_path = results_dir / file_name
     with open(file_path, 'w', encoding='utf-8') as f:
-        csv.writer(
-            f, dialect=csv.unix_dialect
-        ).writerows(
-            results
-        )
+        writer = csv.writer(f, dialect=csv.unix_dialect)
+        for row in results:
+            writer.writerow(row)
+            f.flush()
     logging.info(FILE_SAVED_MESSAGE.format(file_path=file_path))
 
 
+def sqlite_output(results, cli_args):
+    results_dir = BASE_DIR / 'results'
+    results_dir.mkdir(exist_ok=True)
+    db_path = results_dir / RESULTS_DB_NAME
+    parser_mode = cli_args.mode
+    status_column = STATUS_COLUMNS.get(parser_mode)
+    results = iter(results)
+    connection = sqlite3.connect(db_path)
+    try:
+        with connection:
+            connection.executescript(CREATE_RESULTS_SQL)
+            run_id = connection.execute(INSERT_RUN_SQL, (
+                parser_mode,
+                dt.datetime.now().isoformat(timespec='seconds'),
+                json.dumps(next(results), ensure_ascii=False),
+            )).lastrowid
+        count = 0
+        while True:
+            batch = [
+                (
+                    run_id,
+                    parser_mode,
+                    count + position,
+                    None if status_column is None else row[status_column],
+                    json.dumps(row, ensure_ascii=False),
+                )
+                for position, row in enumerate(
+                    islice(results, SQLITE_BATCH_SIZE)
+                )
+            ]
+            if not batch:
+                break
+            with connection:
+                connection.executemany(INSERT_ROW_SQL, batch)
+            count += len(batch)
+    finally:
+        connection.close()
+    logging.info(
+        DB_SAVED_MESSAGE.format(run_id=run_id, db_path=db_path, count=count)
+    )
+
+
+def jsonl_output(results, *args):
+    results = iter(results)
+    header = next(results)
+    for row in results:
+        print(
+            json.dumps(dict(zip(header, row)), ensure_ascii=False),
+            flush=True
+        )
+
+
 OUTPUT_MODES = {
     PRETTY_TABLE_OUTPUT: pretty_output,
     FILE_OUTPUT: file_output,
+    SQLITE_OUTPUT: sqlite_output,
+    JSONL_OUTPUT: jsonl_output,
     None: default_output
 }
 
@@ -0,0 +1,93 @@
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+import threading
+
+from constants import DEFAULT_PARSE_CHUNK_SIZE, PARSE_FLUSH_TIMEOUT
+
+
+def extract_batch(items):
+    results = []
+    for extract, html in items:
+        try:
+            results.append((True, extract(html)))
+        except Exception as error:
+            results.append((False, error))
+    return results
+
+
+class ParsePool:
+    """Разбор страниц в пуле процессов.
+
+    Потоки загрузки передают в пул тела страниц, а получают только
+    извлечённые значения. Страницы отправляются в процессы пачками
+    по chunk_size; неполная пачка уходит сразу, когда все callers
+    потоков загрузки ждут разбора, а иначе — если результата не было
+    дольше PARSE_FLUSH_TIMEOUT секунд.
+    """
+
+    def __init__(
+        self, workers, chunk_size=DEFAULT_PARSE_CHUNK_SIZE, callers=None
+    ):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.chunk_size = chunk_size
+        self.callers = callers
+        self.lock = threading.Lock()
+        self.pending = []
+        self.waiting = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return
+        futures = [future for _, _, future in batch]
+        batch_future = self.executor.submit(
+            extract_batch, [(extract, html) for extract, html, _ in batch]
+        )
+        batch_future.add_done_callback(
+            lambda done: self.resolve(done, futures)
+        )
+
+    @staticmethod
+    def resolve(batch_future, futures):
+        try:
+            results = batch_future.result()
+        except Exception as error:
+            for future in futures:
+                future.set_exception(error)
+            return
+        for future, (ok, value) in zip(futures, results):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def extract(self, extract, html):
+        future = Future()
+        with self.lock:
+            self.pending.append((extract, html, future))
+            self.waiting += 1
+            # Пачку больше некому дополнить, если все потоки уже ждут
+            full = len(self.pending) >= self.chunk_size or (
+                self.callers is not None and self.waiting >= self.callers
+            )
+        try:
+            if full:
+                self.flush()
+            try:
+                return future.result(timeout=PARSE_FLUSH_TIMEOUT)
+            except TimeoutError:
+                self.flush()
+                return future.result()
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def close(self):
+        self.flush()
+        self.executor.shutdown()
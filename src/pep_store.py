@@ -0,0 +1,150 @@
+import json
+import re
+import sqlite3
+import time
+
+
+PEP_NUMBER_PATTERN = r'pep-(?P<number>\d+)'
+# Адрес автора в шапке: «Guido van Rossum <guido at python.org>»
+AUTHOR_EMAIL_PATTERN = r'\s*<[^>]*>'
+CREATE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS peps (
+    url TEXT PRIMARY KEY,
+    number INTEGER,
+    title TEXT NOT NULL,
+    status TEXT,
+    type TEXT,
+    created TEXT,
+    fields TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pep_authors (
+    url TEXT NOT NULL REFERENCES peps (url),
+    author TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pep_python_versions (
+    url TEXT NOT NULL REFERENCES peps (url),
+    version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS peps_status_type ON peps (status, type);
+CREATE INDEX IF NOT EXISTS peps_type ON peps (type);
+CREATE INDEX IF NOT EXISTS pep_authors_author ON pep_authors (author);
+CREATE INDEX IF NOT EXISTS pep_authors_url ON pep_authors (url);
+CREATE INDEX IF NOT EXISTS pep_python_versions_version
+    ON pep_python_versions (version);
+CREATE INDEX IF NOT EXISTS pep_python_versions_url
+    ON pep_python_versions (url);
+"""
+UPSERT_PEP_SQL = (
+    'INSERT OR REPLACE INTO peps '
+    '(url, number, title, status, type, created, fields, updated_at) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)
+DELETE_AUTHORS_SQL = 'DELETE FROM pep_authors WHERE url = ?'
+DELETE_VERSIONS_SQL = 'DELETE FROM pep_python_versions WHERE url = ?'
+INSERT_AUTHOR_SQL = 'INSERT INTO pep_authors (url, author) VALUES (?, ?)'
+INSERT_VERSION_SQL = (
+    'INSERT INTO pep_python_versions (url, version) VALUES (?, ?)'
+)
+SELECT_PEPS_SQL = 'SELECT number, title, status, type, url FROM peps'
+AUTHOR_FILTER_SQL = (
+    'url IN (SELECT url FROM pep_authors WHERE author = ?)'
+)
+VERSION_FILTER_SQL = (
+    'url IN (SELECT url FROM pep_python_versions WHERE version = ?)'
+)
+
+
+def split_values(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def get_authors(value):
+    return split_values(re.sub(AUTHOR_EMAIL_PATTERN, '', value))
+
+
+def get_pep_number(url):
+    match = re.search(PEP_NUMBER_PATTERN, url)
+    return None if match is None else int(match.group('number'))
+
+
+class PepStore:
+    """Локальная база полей шапки PEP.
+
+    Поля страницы целиком хранятся в JSON, а статус, тип, авторы
+    и версии Python вынесены в индексированные колонки и таблицы,
+    чтобы выборки по ним не требовали нового обхода.
+    """
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        with self.connection:
+            self.connection.executescript(CREATE_TABLES_SQL)
+
+    def save(self, pages, now=None):
+        """Сохраняет пары (ссылка, (заголовок, поля)) одной транзакцией."""
+        now = time.time() if now is None else now
+        with self.connection:
+            for url, (title, fields) in pages:
+                self.connection.execute(UPSERT_PEP_SQL, (
+                    url,
+                    get_pep_number(url),
+                    title,
+                    fields.get('Status'),
+                    fields.get('Type'),
+                    fields.get('Created'),
+                    json.dumps(fields, ensure_ascii=False),
+                    now,
+                ))
+                self.connection.execute(DELETE_AUTHORS_SQL, (url,))
+                self.connection.executemany(INSERT_AUTHOR_SQL, (
+                    (url, author)
+                    for author in get_authors(fields.get('Author', ''))
+                ))
+                self.connection.execute(DELETE_VERSIONS_SQL, (url,))
+                self.connection.executemany(INSERT_VERSION_SQL, (
+                    (url, version) for version in split_values(
+                        fields.get('Python-Version', '')
+                    )
+                ))
+
+    def find(self, status=None, type=None, author=None, python_version=None):
+        """Возвращает (номер, заголовок, статус, тип, ссылка) подходящих PEP.
+
+        Например, принятые PEP Standards Track для Python 3.13:
+        find(status='Accepted', type='Standards Track',
+        python_version='3.13').
+        """
+        conditions, params = [], []
+        for condition, value in (
+            ('status = ?', status),
+            ('type = ?', type),
+            (AUTHOR_FILTER_SQL, author),
+            (VERSION_FILTER_SQL, python_version),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        sql = SELECT_PEPS_SQL
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return self.connection.execute(
+            sql + ' ORDER BY number', params
+        ).fetchall()
+
+    def get_fields(self, url):
+        row = self.connection.execute(
+            'SELECT fields FROM peps WHERE url = ?', (url,)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
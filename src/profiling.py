@@ -0,0 +1,145 @@
+from collections import defaultdict
+from contextlib import contextmanager
+import cProfile
+from functools import wraps
+import logging
+import threading
+import time
+
+
+PROFILE_SAVED_MESSAGE = 'Профиль cProfile сохранён: {path}'
+SUMMARY_HEADER = 'Профиль запуска:'
+STAGE_ROW = (
+    '  {stage:<8} вызовов {calls:>5}  всего {total:>8.3f} с  '
+    'p50 {p50:>7.1f} мс  p95 {p95:>7.1f} мс  max {max:>7.1f} мс'
+)
+CACHE_ROW = '  кеш: попаданий {hits}, промахов {misses}'
+SLOWEST_HEADER = '  самые медленные ссылки:'
+SLOWEST_ROW = '    {total:>8.3f} с  {url}'
+SLOWEST_COUNT = 10
+
+_profiler = None
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+class Profiler:
+    """Время стадий обработки страниц по ссылкам.
+
+    Учитывается собственное время стадии: время вложенных стадий
+    (например, разбора внутри извлечения) из него вычитается.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def call(self, stage, function, args, kwargs, url_arg):
+        stack = self.local.__dict__.setdefault('stack', [])
+        if url_arg is not None and len(args) > url_arg:
+            self.local.url = args[url_arg]
+        stack.append(0.0)
+        started = time.perf_counter()
+        result = None
+        try:
+            result = function(*args, **kwargs)
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self.lock:
+                self.records.append((
+                    stage,
+                    getattr(self.local, 'url', None),
+                    elapsed - nested,
+                    getattr(result, 'from_cache', None),
+                ))
+
+    def totals(self):
+        totals = defaultdict(float)
+        for stage, _, duration, _ in self.records:
+            totals[stage] += duration
+        return totals
+
+    def calls(self, stage):
+        return sum(1 for record in self.records if record[0] == stage)
+
+    def summary(self):
+        durations = defaultdict(list)
+        by_url = defaultdict(float)
+        cache = defaultdict(int)
+        for stage, url, duration, from_cache in self.records:
+            durations[stage].append(duration)
+            if url is not None:
+                by_url[url] += duration
+            if from_cache is not None:
+                cache[from_cache] += 1
+        lines = [SUMMARY_HEADER]
+        for stage, values in durations.items():
+            lines.append(STAGE_ROW.format(
+                stage=stage,
+                calls=len(values),
+                total=sum(values),
+                p50=percentile(values, 0.5) * 1000,
+                p95=percentile(values, 0.95) * 1000,
+                max=max(values) * 1000,
+            ))
+        lines.append(CACHE_ROW.format(hits=cache[True], misses=cache[False]))
+        lines.append(SLOWEST_HEADER)
+        for url, total in sorted(
+            by_url.items(), key=lambda item: item[1], reverse=True
+        )[:SLOWEST_COUNT]:
+            lines.append(SLOWEST_ROW.format(total=total, url=url))
+        return '\n'.join(lines)
+
+
+def enable():
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def profiled(stage, url_arg=None):
+    """Замеряет время функции как стадии stage.
+
+    Пока профилирование выключено, обёртка только вызывает функцию.
+    url_arg — номер позиционного аргумента со ссылкой на страницу.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return function(*args, **kwargs)
+            return profiler.call(stage, function, args, kwargs, url_arg)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile_run(enabled=False, output=None):
+    profiler = enable() if enabled else None
+    cprofile = cProfile.Profile() if output is not None else None
+    if cprofile is not None:
+        cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(output)
+            logging.info(PROFILE_SAVED_MESSAGE.format(path=output))
+        if profiler is not None:
+            logging.info(profiler.summary())
+            disable()
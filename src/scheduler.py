@@ -0,0 +1,168 @@
+from contextlib import contextmanager
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+from constants import (
+    DEFAULT_HOST_RATE, INITIAL_HOST_CONCURRENCY, LATENCY_SLOWDOWN_FACTOR,
+    LEAF_PRIORITY, THROTTLE_STATUSES
+)
+
+
+HOST_SUMMARY_MESSAGE = (
+    '{host}: лимит {limit:.1f} (макс. {max_limit}), запросов {requests}, '
+    'ответов 429/503 {throttled}, замедлений {slowdowns}, '
+    'ожидание в очереди {waited:.1f} с'
+)
+
+_local = threading.local()
+
+
+@contextmanager
+def request_priority(priority):
+    """Задаёт приоритет запросов текущего потока (меньше — раньше)."""
+    previous = getattr(_local, 'priority', LEAF_PRIORITY)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority():
+    return getattr(_local, 'priority', LEAF_PRIORITY)
+
+
+class HostLimiter:
+    """Token bucket и адаптивный лимит параллельных запросов к хосту.
+
+    Лимит растёт на единицу за «окно» успешных ответов, пока задержка
+    стабильна, и уменьшается вдвое при 429/503 или ошибке соединения
+    и на четверть, когда задержка превышает базовую в
+    LATENCY_SLOWDOWN_FACTOR раз. Ожидающие запросы получают слот
+    в порядке приоритета.
+    """
+
+    def __init__(self, rate, max_limit):
+        self.rate = rate
+        self.max_limit = max_limit
+        self.limit = float(min(INITIAL_HOST_CONCURRENCY, max_limit))
+        self.tokens = 1.0
+        self.refilled = time.monotonic()
+        self.in_flight = 0
+        self.waiting = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.baseline = None
+        self.requests = self.throttled = self.slowdowns = 0
+        self.waited = 0.0
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            max(1.0, self.rate),
+            self.tokens + (now - self.refilled) * self.rate
+        )
+        self.refilled = now
+
+    def acquire(self, priority):
+        started = time.monotonic()
+        entry = (priority, next(self.counter))
+        with self.condition:
+            heapq.heappush(self.waiting, entry)
+            while True:
+                self.refill()
+                if (
+                    self.waiting[0] is entry
+                    and self.in_flight < int(self.limit)
+                    and self.tokens >= 1
+                ):
+                    break
+                self.condition.wait(
+                    (1 - self.tokens) / self.rate if self.tokens < 1
+                    else None
+                )
+            heapq.heappop(self.waiting)
+            self.tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            self.waited += time.monotonic() - started
+            self.condition.notify_all()
+
+    def release(self, throttled, latency):
+        with self.condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self.limit = max(1.0, self.limit / 2)
+            elif (
+                self.baseline is not None
+                and latency > self.baseline * LATENCY_SLOWDOWN_FACTOR
+            ):
+                self.slowdowns += 1
+                self.limit = max(1.0, self.limit * 0.75)
+            else:
+                self.limit = min(
+                    float(self.max_limit), self.limit + 1 / self.limit
+                )
+            if not throttled:
+                self.baseline = latency if self.baseline is None else (
+                    0.9 * self.baseline + 0.1 * latency
+                )
+            self.condition.notify_all()
+
+
+class Scheduler:
+    """Планировщик сетевых запросов с отдельным лимитом на каждый хост."""
+
+    def __init__(self, rate=DEFAULT_HOST_RATE, max_concurrency=1):
+        self.rate = rate
+        self.max_concurrency = max_concurrency
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def get_limiter(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostLimiter(
+                    self.rate, self.max_concurrency
+                )
+            return self.hosts[host]
+
+    @contextmanager
+    def slot(self, url):
+        limiter = self.get_limiter(url)
+        limiter.acquire(current_priority())
+        started = time.monotonic()
+        outcome = {'throttled': True}
+        try:
+            yield outcome
+        finally:
+            limiter.release(
+                outcome['throttled'], time.monotonic() - started
+            )
+
+    def summary(self):
+        return '\n'.join(
+            HOST_SUMMARY_MESSAGE.format(
+                host=host,
+                limit=limiter.limit,
+                max_limit=limiter.max_limit,
+                requests=limiter.requests,
+                throttled=limiter.throttled,
+                slowdowns=limiter.slowdowns,
+                waited=limiter.waited,
+            )
+            for host, limiter in self.hosts.items()
+        )
+
+
+def is_throttled(response):
+    retries = getattr(response.raw, 'retries', None)
+    history = retries.history if retries is not None else ()
+    return response.status_code in THROTTLE_STATUSES or any(
+        attempt.status in THROTTLE_STATUSES for attempt in history
+    )
@@ -0,0 +1,193 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+from socketserver import ThreadingUnixStreamServer
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from constants import DEFAULT_REFRESH_INTERVAL
+from metrics import MODE_DURATION, MODE_FAILURES, registry
+
+
+SERVE_START_MESSAGE = 'Сервер отвечает по адресу {address}'
+SERVE_STOP_MESSAGE = 'Сервер остановлен'
+REFRESH_MESSAGE = 'Результаты режима {mode} обновлены за {elapsed:.2f} с'
+REFRESH_ERROR_MESSAGE = 'Не удалось обновить результаты режима {mode}'
+REQUEST_LOG_MESSAGE = 'Запрос к серверу: {message}'
+METRICS_PATH = '/metrics'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+UNKNOWN_MODE_MESSAGE = 'Неизвестный режим: {mode}'
+NO_RESULTS_MESSAGE = 'Результаты режима {mode} пока недоступны'
+
+
+class ResultStore:
+    """Результаты режимов в памяти, посчитанные на общей тёплой сессии.
+
+    Результаты заполняет фоновое обновление, а get без refresh только
+    отдаёт сохранённые строки и не обходит сайт сам: пока результатов
+    нет, он возвращает None. Режим обновляется не больше чем одним
+    потоком за раз: запрос с refresh, пришедший во время обновления,
+    дожидается его и получает свежие строки. Если обновление упало,
+    остаются прежние результаты.
+    """
+
+    def __init__(self, session, modes, **options):
+        self.session = session
+        self.modes = modes
+        self.options = options
+        self.results = {}
+        self.locks = {mode: threading.Lock() for mode in modes}
+
+    def refresh(self, mode):
+        with self.locks[mode]:
+            started = time.monotonic()
+            try:
+                rows = self.modes[mode](self.session, **self.options)
+            except Exception:
+                MODE_FAILURES.inc(mode=mode)
+                logging.exception(REFRESH_ERROR_MESSAGE.format(mode=mode))
+                return self.results.get(mode)
+            MODE_DURATION.set(time.monotonic() - started, mode=mode)
+            self.results[mode] = {
+                'mode': mode,
+                'updated': time.time(),
+                'header': list(rows[0]) if rows else [],
+                'rows': [list(row) for row in rows[1:]],
+            }
+            logging.info(REFRESH_MESSAGE.format(
+                mode=mode, elapsed=time.monotonic() - started
+            ))
+            return self.results[mode]
+
+    def get(self, mode, refresh=False):
+        if mode not in self.modes:
+            raise KeyError(mode)
+        if refresh:
+            return self.refresh(mode)
+        return self.results.get(mode)
+
+    def refresh_all(self):
+        for mode in self.modes:
+            self.refresh(mode)
+
+    def summary(self):
+        return {
+            mode: self.results[mode]['updated'] if mode in self.results
+            else None
+            for mode in self.modes
+        }
+
+
+class ResultHandler(BaseHTTPRequestHandler):
+    """GET / — время обновления режимов, GET /<режим> — его строки
+    или 503, пока их нет, GET /<режим>?refresh=1 — пересчитать
+    результаты перед ответом, GET /metrics — метрики процесса
+    в текстовом формате Prometheus."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == METRICS_PATH:
+            return self.send_body(
+                200, PROMETHEUS_CONTENT_TYPE,
+                registry.to_prometheus().encode('utf-8')
+            )
+        mode = url.path.strip('/')
+        if not mode:
+            return self.send_json(200, self.server.store.summary())
+        refresh = parse_qs(url.query).get('refresh', ['0'])[0] == '1'
+        try:
+            result = self.server.store.get(mode, refresh)
+        except KeyError:
+            return self.send_json(
+                404, {'error': UNKNOWN_MODE_MESSAGE.format(mode=mode)}
+            )
+        if result is None:
+            return self.send_json(
+                503, {'error': NO_RESULTS_MESSAGE.format(mode=mode)}
+            )
+        self.send_json(200, result)
+
+    def send_json(self, status, data):
+        self.send_body(
+            status, 'application/json; charset=utf-8',
+            json.dumps(data, ensure_ascii=False).encode('utf-8')
+        )
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # У соединений через Unix-сокет нет адреса клиента
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        logging.debug(REQUEST_LOG_MESSAGE.format(message=format % args))
+
+
+class ResultHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store):
+        super().__init__(address, ResultHandler)
+        self.store = store
+
+
+class ResultUnixServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, store):
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(str(path), ResultHandler)
+        self.store = store
+
+    def server_close(self):
+        super().server_close()
+        os.unlink(self.server_address)
+
+
+def create_server(store, host, port, socket_path=None):
+    if socket_path is not None:
+        return ResultUnixServer(socket_path, store)
+    return ResultHTTPServer((host, port), store)
+
+
+def refresh_periodically(store, interval, stopped):
+    while True:
+        store.refresh_all()
+        if stopped.wait(interval):
+            return
+
+
+def serve(
+    store, host, port, socket_path=None,
+    refresh_interval=DEFAULT_REFRESH_INTERVAL
+):
+    """Отвечает на запросы результатов, пока процесс не прервут.
+
+    Первый расчёт всех режимов и дальнейшие обновления раз в
+    refresh_interval секунд идут в фоновом потоке.
+    """
+    server = create_server(store, host, port, socket_path)
+    stopped = threading.Event()
+    refresher = threading.Thread(
+        target=refresh_periodically,
+        args=(store, refresh_interval, stopped),
+        daemon=True
+    )
+    refresher.start()
+    logging.info(SERVE_START_MESSAGE.format(address=server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        server.server_close()
+        logging.info(SERVE_STOP_MESSAGE)
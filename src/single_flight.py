@@ -0,0 +1,62 @@
+import threading
+
+
+SINGLE_FLIGHT_SUMMARY_MESSAGE = (
+    'Запросы: ссылок приведено к канонической форме {deduplicated}, '
+    'объединено с уже идущими {coalesced}'
+)
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Объединяет одновременные вызовы с одинаковым ключом.
+
+    Первый вызов выполняет функцию, остальные ждут и получают тот же
+    результат или то же исключение. Завершившийся вызов ничего не
+    запоминает: следующий вызов выполнит функцию заново.
+    """
+
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.coalesced = 0
+        self.deduplicated = 0
+
+    def do(self, key, function, *args, **kwargs):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = function(*args, **kwargs)
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    def count_deduplicated(self):
+        with self.lock:
+            self.deduplicated += 1
+
+    def summary(self):
+        return SINGLE_FLIGHT_SUMMARY_MESSAGE.format(
+            deduplicated=self.deduplicated, coalesced=self.coalesced
+        )
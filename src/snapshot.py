@@ -0,0 +1,52 @@
+import json
+import os
+import time
+
+
+def load_snapshot(path):
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_snapshot(path, snapshot):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def get_outdated_links(snapshot, rows, max_age, now=None):
+    """Возвращает ссылки, которые нужно проверить заново.
+
+    Заново проверяются новые PEP, PEP со сменившейся буквой статуса
+    в таблице и записи старше max_age секунд.
+    """
+    now = time.time() if now is None else now
+    outdated = {}
+    for link, table_status, *_ in rows:
+        entry = snapshot.get(link)
+        if (
+            entry is None
+            or entry['table_status'] != table_status
+            or now - entry['checked_at'] > max_age
+        ):
+            outdated[link] = None
+    return outdated
+
+
+def update_snapshot(snapshot, rows, page_statuses, now=None):
+    now = time.time() if now is None else now
+    table_statuses = {
+        link: table_status for link, table_status, *_ in rows
+    }
+    for link, page_status in page_statuses:
+        if isinstance(page_status, Exception):
+            continue
+        snapshot[link] = {
+            'table_status': table_statuses[link],
+            'page_status': page_status,
+            'checked_at': now,
+        }
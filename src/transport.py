@@ -0,0 +1,120 @@
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from constants import (
+    DEFAULT_BACKOFF_FACTOR, DEFAULT_POOL_SIZE, DEFAULT_RETRIES,
+    RETRY_STATUSES
+)
+from scheduler import is_throttled
+
+
+TRANSPORT_SUMMARY_MESSAGE = (
+    'HTTP: запросов {requests}, новых соединений {connections}, '
+    'повторно использовано {reused}, повторов {retries} '
+    '(по Retry-After {retry_after}), ожидание перед повторами {backoff:.1f} с'
+)
+
+
+class TransportStats:
+    """Счётчики повторов и ожидания между ними."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.retries = 0
+        self.retry_after = 0
+        self.backoff = 0.0
+
+    def add(self, retries=0, retry_after=0, backoff=0.0):
+        with self.lock:
+            self.retries += retries
+            self.retry_after += retry_after
+            self.backoff += backoff
+
+
+class CountingRetry(Retry):
+    def __init__(self, *args, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+
+    def new(self, **kwargs):
+        return super().new(stats=self.stats, **kwargs)
+
+    def increment(self, *args, **kwargs):
+        self.stats.add(retries=1)
+        return super().increment(*args, **kwargs)
+
+    def sleep(self, response=None):
+        started = time.monotonic()
+        super().sleep(response)
+        retry_after = int(
+            self.respect_retry_after_header
+            and response is not None
+            and self.get_retry_after(response) is not None
+        )
+        self.stats.add(
+            retry_after=retry_after, backoff=time.monotonic() - started
+        )
+
+
+class PooledAdapter(HTTPAdapter):
+    """Адаптер с пулом соединений на хост и повторами с backoff."""
+
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        retries=DEFAULT_RETRIES,
+        backoff_factor=DEFAULT_BACKOFF_FACTOR,
+        scheduler=None,
+    ):
+        self.stats = TransportStats()
+        self.scheduler = scheduler
+        super().__init__(
+            pool_connections=2,
+            pool_maxsize=pool_size,
+            max_retries=CountingRetry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=('GET', 'HEAD'),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+                stats=self.stats,
+            ),
+        )
+
+    def send(self, request, **kwargs):
+        if self.scheduler is None:
+            return super().send(request, **kwargs)
+        with self.scheduler.slot(request.url) as outcome:
+            response = super().send(request, **kwargs)
+            outcome['throttled'] = is_throttled(response)
+        return response
+
+    def summary(self):
+        pools = [
+            self.poolmanager.pools[key]
+            for key in self.poolmanager.pools.keys()
+        ]
+        requests = sum(pool.num_requests for pool in pools)
+        connections = sum(pool.num_connections for pool in pools)
+        summary = TRANSPORT_SUMMARY_MESSAGE.format(
+            requests=requests,
+            connections=connections,
+            reused=max(0, requests - connections),
+            retries=self.stats.retries,
+            retry_after=self.stats.retry_after,
+            backoff=self.stats.backoff,
+        )
+        if self.scheduler is None or not self.scheduler.hosts:
+            return summary
+        return f'{summary}\n{self.scheduler.summary()}'
+
+
+def mount_transport(session, pool_size=DEFAULT_POOL_SIZE, **kwargs):
+    adapter = PooledAdapter(max(pool_size, DEFAULT_POOL_SIZE), **kwargs)
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, adapter)
+    return adapter
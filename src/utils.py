@@ -1,25 +1,84 @@
-from requests import RequestException
-
-from bs4 import BeautifulSoup
+from functools import lru_cache
+import hashlib
+import time
+from urllib.parse import urlsplit, urlunsplit
 
+from constants import INDEX_PRIORITY, LEAF_PRIORITY, TRAILING_SLASH_HOSTS
 from exceptions import ParserFindTagException
+from metrics import record_error, record_response
+from profiling import profiled
+from scheduler import request_priority
+from single_flight import SingleFlight
 
 
 FIND_TAG_ERROR_MESSAGE = 'Не найден тег {tag} {attrs}'
 REQUEST_ERROR_MESSAGE = 'Возникла ошибка при загрузке страницы {url}'
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+INDEX_PAGES = ('index.html', 'index.htm')
+
+flights = SingleFlight()
+
+
+def canonical_url(url):
+    """Приводит разные ссылки на одну страницу к одному виду.
+
+    Отбрасываются якорь, порт по умолчанию и index.html в конце пути,
+    схема и хост переводятся в нижний регистр. На сайтах из
+    TRAILING_SLASH_HOSTS путь без расширения в последнем сегменте
+    получает завершающий слеш.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    userinfo, at, host = parts.netloc.rpartition('@')
+    host = host.lower()
+    default_port = f':{DEFAULT_PORTS.get(scheme)}'
+    if host.endswith(default_port):
+        host = host[:-len(default_port)]
+    path = parts.path or '/'
+    head, _, last = path.rpartition('/')
+    if last in INDEX_PAGES:
+        path = head + '/'
+    elif last and '.' not in last and host in TRAILING_SLASH_HOSTS:
+        path += '/'
+    return urlunsplit((scheme, userinfo + at + host, path, parts.query, ''))
+
 
+def fetch(session, url, priority):
+    started = time.perf_counter()
+    try:
+        with request_priority(priority):
+            response = session.get(url)
+    except OSError:
+        record_error(url)
+        raise
+    record_response(url, response, time.perf_counter() - started)
+    response.encoding = 'utf-8'
+    return response
+
+
+@profiled('fetch', url_arg=1)
+def get_response(session, url, priority=LEAF_PRIORITY):
+    """Загружает страницу по канонической ссылке.
 
-def get_response(session, url):
+    Одновременные запросы одной страницы через одну сессию
+    объединяются в один.
+    """
+    from requests import RequestException
+
+    canonical = canonical_url(url)
+    if canonical != url:
+        flights.count_deduplicated()
     try:
-        response = session.get(url)
-        response.encoding = 'utf-8'
-        return response
+        return flights.do(
+            (id(session), canonical), fetch, session, canonical, priority
+        )
     except RequestException:
         raise ConnectionError(
             REQUEST_ERROR_MESSAGE.format(url=url)
         )
 
 
+@profiled('find')
 def find_tag(soup, tag, attrs=None):
     searched_tag = soup.find(tag, attrs=({} if attrs is None else attrs))
     if searched_tag is None:
@@ -29,5 +88,46 @@ def find_tag(soup, tag, attrs=None):
     return searched_tag
 
 
+@profiled('parse')
+def parse_html(html, parse_only=None):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, features='lxml', parse_only=parse_only)
+
+
+@lru_cache(maxsize=None)
+def get_strainer(tags):
+    from bs4 import SoupStrainer
+
+    return SoupStrainer(tags)
+
+
 def get_soup(session, url):
-    return BeautifulSoup(get_response(session, url).text, features='lxml')
+    return parse_html(get_response(session, url, INDEX_PRIORITY).text)
+
+
+def get_response_key(response):
+    etag = response.headers.get('ETag')
+    if etag:
+        return etag
+    return hashlib.sha256(response.content).hexdigest()
+
+
+def run_extract(extract, html, parse_pool=None):
+    if parse_pool is None:
+        return extract(html)
+    return parse_pool.extract(extract, html)
+
+
+def get_extracted(
+    session, url, extract, extraction_cache=None, parse_pool=None
+):
+    response = get_response(session, url)
+    if extraction_cache is None:
+        return run_extract(extract, response.text, parse_pool)
+    key = get_response_key(response)
+    value = extraction_cache.get(extract.__name__, url, key)
+    if value is None:
+        value = run_extract(extract, response.text, parse_pool)
+        extraction_cache.set(extract.__name__, url, key, value)
+    return value
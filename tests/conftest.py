@@ -1,5 +1,8 @@
+import hashlib
 import pytest
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from bs4 import BeautifulSoup
 import requests_mock
@@ -110,3 +113,84 @@ def records():
         result = results[mode]
         return converting(result)
     return _records
+
+
+class StubServer:
+    """Локальный HTTP-сервер для офлайн-тестов."""
+
+    def __init__(self):
+        self.pages = {}
+        self.failures = {}
+        self.requests = []
+        stub = self
+
+        class StubHandler(BaseHTTPRequestHandler):
+            def send_page(self, with_body):
+                stub.requests.append((self.command, self.path, self.headers))
+                failures = stub.failures.get(self.path)
+                if failures:
+                    self.send_response(failures.pop(0))
+                    self.send_header('Retry-After', '0')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if self.path not in stub.pages:
+                    self.send_error(404)
+                    return
+                body = stub.pages[self.path]
+                etag = '"{}"'.format(hashlib.sha256(body).hexdigest())
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                status = 200
+                range_header = self.headers.get('Range')
+                if_range = self.headers.get('If-Range')
+                if range_header and if_range in (None, etag):
+                    start = int(range_header[len('bytes='):].rstrip('-'))
+                    if start >= len(body):
+                        self.send_response(416)
+                        self.send_header(
+                            'Content-Range', f'bytes */{len(body)}'
+                        )
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    body = body[start:]
+                    status = 206
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                if with_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self.send_page(with_body=True)
+
+            def do_HEAD(self):
+                self.send_page(with_body=False)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def count(self, command, path):
+        return sum(
+            1 for request_command, request_path, _ in self.requests
+            if (request_command, request_path) == (command, path)
+        )
+
+
+@pytest.fixture
+def stub_server():
+    stub = StubServer()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
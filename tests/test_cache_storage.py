@@ -0,0 +1,69 @@
+import sqlite3
+import zlib
+
+import pytest
+import requests
+try:
+    from src import cache_storage, http_cache
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `cache_storage.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `cache_storage.py`'
+    )
+
+
+def make_response(headers):
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+
+@pytest.mark.parametrize('headers, expected', [
+    ({'Content-Type': 'text/html; charset=utf-8'}, True),
+    ({'Content-Type': 'application/zip'}, False),
+    ({'Content-Type': 'application/pdf', 'Content-Length': '10'}, False),
+    ({'Content-Type': 'text/html', 'Content-Length': str(10 ** 8)}, False),
+    ({}, True),
+])
+def test_is_cacheable(headers, expected):
+    assert cache_storage.is_cacheable(make_response(headers)) is expected
+
+
+def test_lru_eviction(tmp_path):
+    responses = cache_storage.BoundedSQLiteDict(
+        tmp_path / 'http_cache.sqlite', max_size=2500,
+        table_name='responses', serializer=None
+    )
+    responses['pep-1'] = b'1' * 1000
+    responses['pep-2'] = b'2' * 1000
+    assert responses['pep-1'] == b'1' * 1000
+    responses['pep-3'] = b'3' * 1000
+    assert set(responses) == {'pep-1', 'pep-3'}, (
+        'При превышении предела должна вытесняться запись, '
+        'к которой дольше всего не обращались'
+    )
+    assert responses.total_size() == 2000
+    responses.clear()
+    assert responses.total_size() == 0
+
+
+def test_session_compresses_and_counts(stub_server, tmp_path):
+    stub_server.pages['/pep-0008/'] = b'<html>PEP 8</html>' * 1000
+    cache_path = tmp_path / 'http_cache'
+    session = http_cache.create_session(cache_path=cache_path)
+    url = f'{stub_server.url}/pep-0008/'
+    assert not session.get(url).from_cache
+    assert session.get(url).text == '<html>PEP 8</html>' * 1000
+    with sqlite3.connect(f'{cache_path}.sqlite') as connection:
+        (value,) = connection.execute(
+            'SELECT value FROM responses'
+        ).fetchone()
+    assert len(value) < 1000, 'Ответы в кеше должны храниться сжатыми'
+    zlib.decompress(value)
+    assert (session.hits, session.lookups) == (1, 2)
+    summary = session.summary()
+    assert 'записей 1' in summary
+    assert 'попаданий 1 из 2 (50.0%)' in summary
@@ -29,7 +29,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'sqlite', 'jsonl'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +64,11 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('rate', ['0', '-1', 'nan', 'inf'])
+def test_rate_must_be_positive(rate):
+    parser = configs.configure_argument_parser(('pep',))
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--rate', rate])
+    assert parser.parse_args(['pep', '--rate', '0.5']).rate == 0.5
@@ -0,0 +1,35 @@
+import random
+import time
+
+try:
+    from src import crawler
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `crawler.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `crawler.py`'
+
+
+def slow_extract(session, url):
+    time.sleep(random.random() / 100)
+    if url.endswith('broken'):
+        raise ConnectionError(url)
+    return url.upper()
+
+
+def test_crawl_keeps_order():
+    urls = [f'mock://page/{number}' for number in range(20)]
+    got = crawler.crawl(None, urls, slow_extract, workers=8)
+    assert [url for url, _ in got] == urls, (
+        'Функция `crawl` должна возвращать результаты в порядке ссылок'
+    )
+    assert all(value == url.upper() for url, value in got)
+
+
+def test_crawl_collects_connection_errors():
+    got = dict(crawler.crawl(
+        None, ['mock://ok', 'mock://broken'], slow_extract, workers=2
+    ))
+    assert got['mock://ok'] == 'MOCK://OK'
+    assert isinstance(got['mock://broken'], ConnectionError), (
+        'Ошибка загрузки страницы должна возвращаться вместо результата'
+    )
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+
+import pytest
+try:
+    from src import downloader
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloader.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloader.py`'
+
+
+ARCHIVE = bytes(range(256)) * 1024
+
+
+def etag(body):
+    return '"{}"'.format(hashlib.sha256(body).hexdigest())
+
+
+def test_download_file(stub_server, tempfile_session, tmp_path):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    transferred, _ = downloader.download_file(
+        tempfile_session, f'{stub_server.url}/archive.zip', path
+    )
+    assert transferred == len(ARCHIVE)
+    assert path.read_bytes() == ARCHIVE
+    assert not (tmp_path / 'archive.zip.part').exists(), (
+        'Временный файл должен переименовываться после загрузки'
+    )
+
+
+def test_download_file_resumes(stub_server, tempfile_session, tmp_path):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    (tmp_path / 'archive.zip.part').write_bytes(ARCHIVE[:1000])
+    (tmp_path / 'archive.zip.part.etag').write_text(
+        etag(ARCHIVE), encoding='utf-8'
+    )
+    transferred, _ = downloader.download_file(
+        tempfile_session, f'{stub_server.url}/archive.zip', path
+    )
+    assert transferred == len(ARCHIVE) - 1000, (
+        'Прерванная загрузка должна продолжаться Range-запросом'
+    )
+    assert path.read_bytes() == ARCHIVE
+    assert not (tmp_path / 'archive.zip.part.etag').exists()
+
+
+@pytest.mark.parametrize('part_etag', [None, etag(b'old archive')])
+def test_download_file_restarts_stale_part(
+    stub_server, tempfile_session, tmp_path, part_etag
+):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    (tmp_path / 'archive.zip.part').write_bytes(b'old archive')
+    if part_etag is not None:
+        (tmp_path / 'archive.zip.part.etag').write_text(
+            part_etag, encoding='utf-8'
+        )
+    transferred, _ = downloader.download_file(
+        tempfile_session, f'{stub_server.url}/archive.zip', path
+    )
+    assert transferred == len(ARCHIVE), (
+        'Начало другой версии файла не должно докачиваться'
+    )
+    assert path.read_bytes() == ARCHIVE
+
+
+def test_download_file_finishes_complete_part(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    (tmp_path / 'archive.zip.part').write_bytes(ARCHIVE)
+    (tmp_path / 'archive.zip.part.etag').write_text(
+        etag(ARCHIVE), encoding='utf-8'
+    )
+    transferred, _ = downloader.download_file(
+        tempfile_session, f'{stub_server.url}/archive.zip', path
+    )
+    assert transferred == 0, (
+        'Докачанный целиком .part должен переименовываться без загрузки'
+    )
+    assert path.read_bytes() == ARCHIVE
+    assert stub_server.count('GET', '/archive.zip') == 0
+    assert not (tmp_path / 'archive.zip.part').exists()
+
+
+def test_download_file_restarts_unsatisfiable_range(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    (tmp_path / 'archive.zip.part').write_bytes(ARCHIVE + b'tail')
+    (tmp_path / 'archive.zip.part.etag').write_text(
+        etag(ARCHIVE), encoding='utf-8'
+    )
+    url = f'{stub_server.url}/archive.zip'
+    transferred, _ = downloader.download_file(tempfile_session, url, path)
+    assert transferred == len(ARCHIVE), (
+        'После ответа 416 загрузка должна начинаться заново'
+    )
+    assert path.read_bytes() == ARCHIVE
+    assert downloader.download_file(tempfile_session, url, path)[0] == 0
+
+
+def test_download_file_skips_existing(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    url = f'{stub_server.url}/archive.zip'
+    downloader.download_file(tempfile_session, url, path)
+    transferred, _ = downloader.download_file(tempfile_session, url, path)
+    assert transferred == 0, 'Актуальный файл не должен скачиваться повторно'
+    assert stub_server.count('GET', '/archive.zip') == 1
+
+
+def test_download_file_fetches_changed_etag(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/archive.zip'] = ARCHIVE
+    path = tmp_path / 'archive.zip'
+    url = f'{stub_server.url}/archive.zip'
+    downloader.download_file(tempfile_session, url, path)
+    stub_server.pages['/archive.zip'] = ARCHIVE[::-1]
+    transferred, _ = downloader.download_file(tempfile_session, url, path)
+    assert transferred == len(ARCHIVE), (
+        'Файл с другим ETag того же размера должен скачиваться заново'
+    )
+    assert path.read_bytes() == ARCHIVE[::-1]
+
+
+def test_archive_mirror_writes_manifest(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/docs-html.zip'] = ARCHIVE
+    stub_server.pages['/docs-text.zip'] = ARCHIVE[:5000]
+    mirror = downloader.ArchiveMirror(tmp_path)
+    for name in ('docs-html.zip', 'docs-text.zip'):
+        path, transferred = mirror.download(
+            tempfile_session, f'{stub_server.url}/{name}'
+        )
+        assert path == tmp_path / name
+        assert transferred == path.stat().st_size
+    mirror.save()
+    manifest = json.loads(
+        (tmp_path / 'manifest.json').read_text(encoding='utf-8')
+    )
+    assert manifest['docs-text.zip']['size'] == 5000
+    assert manifest['docs-text.zip']['sha256'] == (
+        hashlib.sha256(ARCHIVE[:5000]).hexdigest()
+    )
+    assert manifest['docs-html.zip']['url'].endswith('/docs-html.zip')
+
+
+def test_archive_mirror_redownloads_corrupted(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/docs.zip'] = ARCHIVE
+    url = f'{stub_server.url}/docs.zip'
+    downloader.ArchiveMirror(tmp_path).download(tempfile_session, url)
+    mirror = downloader.ArchiveMirror(tmp_path)
+    mirror.download(tempfile_session, url)
+    mirror.save()
+    assert stub_server.count('GET', '/docs.zip') == 1, (
+        'Файл, совпадающий с манифестом, не должен скачиваться повторно'
+    )
+    (tmp_path / 'docs.zip').write_bytes(bytes(len(ARCHIVE)))
+    _, transferred = downloader.ArchiveMirror(tmp_path).download(
+        tempfile_session, url
+    )
+    assert transferred == len(ARCHIVE), (
+        'Файл с другим SHA-256 того же размера должен скачиваться заново'
+    )
+    assert (tmp_path / 'docs.zip').read_bytes() == ARCHIVE
+
+
+def test_archive_mirror_refreshes_changed_archive(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/docs.zip'] = ARCHIVE
+    url = f'{stub_server.url}/docs.zip'
+    mirror = downloader.ArchiveMirror(tmp_path)
+    mirror.download(tempfile_session, url)
+    mirror.save()
+    stub_server.pages['/docs.zip'] = ARCHIVE[::-1]
+    mirror = downloader.ArchiveMirror(tmp_path)
+    _, transferred = mirror.download(tempfile_session, url)
+    mirror.save()
+    assert transferred == len(ARCHIVE), (
+        'Архив с новым ETag на сервере должен скачиваться заново'
+    )
+    assert (tmp_path / 'docs.zip').read_bytes() == ARCHIVE[::-1]
+    manifest = json.loads(
+        (tmp_path / 'manifest.json').read_text(encoding='utf-8')
+    )
+    assert manifest['docs.zip']['sha256'] == (
+        hashlib.sha256(ARCHIVE[::-1]).hexdigest()
+    )
+
+
+def test_archive_mirror_trusts_unchanged_files(
+    monkeypatch, stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/docs.zip'] = ARCHIVE
+    url = f'{stub_server.url}/docs.zip'
+    mirror = downloader.ArchiveMirror(tmp_path)
+    mirror.download(tempfile_session, url)
+    mirror.save()
+    hashed = []
+    monkeypatch.setattr(downloader, 'file_digest', hashed.append)
+    _, transferred = downloader.ArchiveMirror(tmp_path).download(
+        tempfile_session, url
+    )
+    assert transferred == 0
+    assert hashed == [], (
+        'Файл с неизменными размером и временем изменения '
+        'не должен перечитываться'
+    )
+
+
+def test_archive_mirror_links_identical_archives(
+    stub_server, tempfile_session, tmp_path
+):
+    stub_server.pages['/docs.zip'] = ARCHIVE
+    stub_server.pages['/docs-copy.zip'] = ARCHIVE
+    mirror = downloader.ArchiveMirror(tmp_path)
+    mirror.download(tempfile_session, f'{stub_server.url}/docs.zip')
+    mirror.download(tempfile_session, f'{stub_server.url}/docs-copy.zip')
+    assert os.path.samefile(tmp_path / 'docs.zip', tmp_path / 'docs-copy.zip')
+    assert (tmp_path / 'docs-copy.zip').read_bytes() == ARCHIVE
@@ -0,0 +1,40 @@
+try:
+    from src import extraction_cache, utils
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `extraction_cache.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `extraction_cache.py`'
+    )
+
+
+def test_extraction_cache_key(tmp_path):
+    cache = extraction_cache.ExtractionCache(tmp_path / 'extractions.sqlite')
+    cache.set('extract_pep_status', 'pep-0008', 'etag-1', 'Active')
+    assert cache.get('extract_pep_status', 'pep-0008', 'etag-1') == 'Active'
+    assert cache.get('extract_pep_status', 'pep-0008', 'etag-2') is None, (
+        'Значение должно отдаваться только при совпадении ключа ответа'
+    )
+    cache.clear()
+    assert cache.get('extract_pep_status', 'pep-0008', 'etag-1') is None
+
+
+def test_get_extracted_skips_parsing(stub_server, tempfile_session):
+    stub_server.pages['/pep-0008/'] = b'<html><h1>PEP 8</h1></html>'
+    url = f'{stub_server.url}/pep-0008/'
+    calls = []
+
+    def extract_title(html):
+        calls.append(html)
+        return utils.parse_html(html).h1.text
+
+    cache = extraction_cache.ExtractionCache()
+    for _ in range(3):
+        assert utils.get_extracted(
+            tempfile_session, url, extract_title, cache
+        ) == 'PEP 8'
+    assert len(calls) == 1, (
+        'Повторный разбор неизменившейся страницы должен пропускаться'
+    )
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+try:
+    from src import extractors
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+
+FIXTURE_DIR = Path(__file__).parent / 'fixture_data'
+
+
+@pytest.fixture
+def page():
+    def _page(name):
+        return (FIXTURE_DIR / name).read_text(encoding='utf-8')
+    return _page
+
+
+def test_extract_pep_status(page):
+    assert extractors.extract_pep_status(page('pep_page.html')) == 'Active'
+
+
+def test_extract_whats_new_page(page):
+    title, editors = extractors.extract_whats_new_page(
+        page('whats_new_page.html')
+    )
+    assert title == 'What’s New In Python 3.11¶'
+    assert 'Pablo Galindo Salgado' in editors
+    assert '\n' not in editors
+
+
+def test_extract_whats_new_page_exception():
+    with pytest.raises(BaseException) as excinfo:
+        extractors.extract_whats_new_page('<html><p>Пусто</p></html>')
+    assert excinfo.typename == 'ParserFindTagException'
+
+
+def test_extract_pep_details(page):
+    title, fields = extractors.extract_pep_details(page('pep_page.html'))
+    assert title == 'PEP 8 – Style Guide for Python Code'
+    assert fields == {
+        'Author': 'Guido van Rossum',
+        'Status': 'Active',
+        'Type': 'Process',
+        'Created': '05-Jul-2001',
+    }
@@ -0,0 +1,48 @@
+import requests
+try:
+    from src import fetch_plan
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `fetch_plan.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `fetch_plan.py`'
+    )
+
+
+def test_plan_urls_deduplicates():
+    mode_urls = {
+        'pep': ('https://peps.python.org/',),
+        'pep-status': ('https://peps.python.org/', 'https://python.org/'),
+    }
+    assert fetch_plan.plan_urls(['pep', 'pep-status', 'other'], mode_urls) == [
+        'https://peps.python.org/', 'https://python.org/'
+    ]
+
+
+def test_prefetch_fetches_shared_pages_once(stub_server):
+    stub_server.pages['/index/'] = b'<html>PEP 0</html>'
+    stub_server.pages['/docs/'] = b'<html>Docs</html>'
+    index_url = f'{stub_server.url}/index/'
+    mode_urls = {
+        'pep': (index_url,),
+        'pep-status': (index_url,),
+        'docs': (f'{stub_server.url}/docs/',),
+        'missing': (f'{stub_server.url}/missing/',),
+    }
+    session = fetch_plan.prefetch(
+        requests.Session(), list(mode_urls), mode_urls, workers=4
+    )
+    assert session.get(index_url).text == '<html>PEP 0</html>'
+    assert session.get(index_url).text == '<html>PEP 0</html>'
+    assert stub_server.count('GET', '/index/') == 1, (
+        'Общая страница нескольких режимов должна загружаться один раз'
+    )
+    assert session.get(f'{stub_server.url}/missing/').status_code == 404
+    session.get(index_url, stream=True).close()
+    assert stub_server.count('GET', '/index/') == 2, (
+        'Запросы с параметрами должны уходить мимо плана'
+    )
+    assert (session.planned, session.requested, session.reused) == (3, 4, 3)
+    assert session.headers is session.session.headers
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+try:
+    from src import http_cache
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `http_cache.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `http_cache.py`'
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('peps.python.org/pep-*=60', ('peps.python.org/pep-*', 60)),
+    ('docs.python.org=-1', ('docs.python.org', -1)),
+])
+def test_parse_expire_pattern(value, expected):
+    assert http_cache.parse_expire_pattern(value) == expected
+
+
+@pytest.mark.parametrize('value', ['peps.python.org', '=60', 'a=b'])
+def test_parse_expire_pattern_error(value):
+    with pytest.raises(ValueError):
+        http_cache.parse_expire_pattern(value)
+
+
+def test_user_expire_patterns_win():
+    got = http_cache.merge_expire_patterns([
+        ('docs.python.org', -1), ('peps.python.org', 60)
+    ])
+    assert got['peps.python.org'] == 60
+    assert list(got)[:2] == ['docs.python.org', 'peps.python.org']
+    assert set(got) == {'docs.python.org', *http_cache.URLS_EXPIRE_AFTER}
+
+
+def test_stale_page_is_revalidated(stub_server, tmp_path):
+    stub_server.pages['/pep-0008/'] = b'<html>PEP 8</html>'
+    session = http_cache.create_session(
+        cache_path=tmp_path / 'cache' / 'http_cache',
+        expire_patterns=[('127.0.0.1', 1)],
+    )
+    url = f'{stub_server.url}/pep-0008/'
+    assert not session.get(url).from_cache
+    assert session.get(url).from_cache
+    time.sleep(1.1)
+    response = session.get(url)
+    assert response.text == '<html>PEP 8</html>'
+    _, _, headers = stub_server.requests[-1]
+    assert headers.get('If-None-Match'), (
+        'Устаревшая страница должна перепроверяться условным запросом'
+    )
@@ -0,0 +1,83 @@
+import pytest
+try:
+    from src import crawler, journal
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `journal.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `journal.py`'
+
+
+URLS = [f'mock://page/{number}' for number in range(10)]
+
+
+def extract(session, url):
+    session.append(url)
+    if url.endswith('/3'):
+        raise ConnectionError(f'Возникла ошибка при загрузке страницы {url}')
+    return [url, url.upper()]
+
+
+def crashing_extract(session, url):
+    if url.endswith('/6'):
+        raise MemoryError(url)
+    return extract(session, url)
+
+
+def test_resume_after_crash(tmp_path):
+    path = tmp_path / 'journals' / 'pep.jsonl'
+    uninterrupted = crawler.crawl([], URLS, extract)
+    with pytest.raises(MemoryError):
+        crawler.crawl(
+            [], URLS, crashing_extract, journal=journal.Journal(path)
+        )
+    fetched = []
+    resumed = journal.Journal(path, resume=True)
+    got = crawler.crawl(fetched, URLS, extract, journal=resumed)
+    assert fetched == [URLS[3], *URLS[6:]], (
+        'После --resume должны загружаться незавершённые ссылки '
+        'и ссылки с ошибкой загрузки'
+    )
+    assert [url for url, _ in got] == URLS
+    assert [
+        str(value) if isinstance(value, Exception) else value
+        for _, value in got
+    ] == [
+        str(value) if isinstance(value, Exception) else value
+        for _, value in uninterrupted
+    ], 'Результат после --resume должен совпадать с непрерывным запуском'
+    resumed.complete()
+    assert not path.exists()
+
+
+def test_resume_retries_failed_urls(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    path.write_text(
+        '{"url": "a", "value": "Active"}\n'
+        '{"url": "b", "error": "Ошибка загрузки"}\n',
+        encoding='utf-8'
+    )
+    fetched = []
+    got = crawler.crawl(
+        fetched, ['a', 'b'],
+        lambda session, url: session.append(url) or url,
+        journal=journal.Journal(path, resume=True)
+    )
+    assert fetched == ['b'], 'Ссылка с ошибкой должна загружаться заново'
+    assert got == [('a', 'Active'), ('b', 'b')]
+
+
+def test_journal_skips_torn_line(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    path.write_text(
+        '{"url": "a", "value": "Active"}\n{"url": "b", "val', encoding='utf-8'
+    )
+    assert journal.Journal.load(path) == {'a': 'Active'}
+
+
+def test_resume_rewrites_torn_journal(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    path.write_text('{"url": "a", "value": "Active"}\n{"url"', encoding='utf-8')
+    resumed = journal.Journal(path, resume=True)
+    resumed.record('b', 'Final')
+    resumed.close()
+    assert journal.Journal.load(path) == {'a': 'Active', 'b': 'Final'}
@@ -0,0 +1,68 @@
+import json
+import logging
+import queue
+
+try:
+    from src import log_handlers
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `log_handlers.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `log_handlers.py`'
+    )
+
+
+def make_record(message, level=logging.ERROR, url=None, exc_info=None):
+    record = logging.LogRecord(
+        'root', level, __file__, 1, message, None, exc_info
+    )
+    if url is not None:
+        record.url = url
+    return record
+
+
+def test_queue_handler_does_not_format():
+    log_queue = queue.SimpleQueue()
+    handler = log_handlers.LocalQueueHandler(log_queue)
+    record = logging.LogRecord(
+        'root', logging.INFO, __file__, 1, 'PEP %s', ('8',), None
+    )
+    handler.emit(record)
+    queued = log_queue.get_nowait()
+    assert queued is record
+    assert (queued.msg, queued.args) == ('PEP %s', ('8',)), (
+        'Запись должна форматироваться в потоке QueueListener'
+    )
+
+
+def test_json_formatter():
+    try:
+        raise ConnectionError('Сайт недоступен')
+    except ConnectionError as error:
+        record = make_record(
+            'Ошибка загрузки', url='https://peps.python.org/pep-0008/',
+            exc_info=(type(error), error, error.__traceback__)
+        )
+    data = json.loads(log_handlers.JsonFormatter().format(record))
+    assert data['level'] == 'ERROR'
+    assert data['message'] == 'Ошибка загрузки'
+    assert data['url'] == 'https://peps.python.org/pep-0008/'
+    assert 'ConnectionError: Сайт недоступен' in data['exception']
+
+
+def test_repeated_errors_are_rate_limited(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(log_handlers.time, 'monotonic', lambda: now[0])
+    errors = log_handlers.RepeatedErrorFilter(interval=60)
+    url = 'https://peps.python.org/pep-0008/'
+    assert errors.filter(make_record('Ошибка', url=url))
+    assert not errors.filter(make_record('Ошибка', url=url))
+    assert not errors.filter(make_record('Другая ошибка', url=url))
+    assert errors.filter(make_record('Ошибка', url='https://python.org/'))
+    assert errors.filter(make_record('Ошибка', level=logging.INFO, url=url))
+    now[0] = 61.0
+    record = make_record('Ошибка', url=url)
+    assert errors.filter(record)
+    assert record.getMessage() == 'Ошибка (повторов подавлено: 2)'
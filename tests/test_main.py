@@ -1,4 +1,5 @@
 import pytest
+from bs4 import BeautifulSoup
 from pathlib import Path
 try:
     from src import main
@@ -140,3 +141,49 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('abbr, expected', [
+    ('<abbr title="Standards Track, Accepted">SA</abbr>', ('A', 'Accepted')),
+    ('<abbr>IF</abbr>', ('F', 'Final')),
+    (None, ('', 'Draft')),
+])
+def test_get_index_status(abbr, expected):
+    tag = None if abbr is None else BeautifulSoup(abbr, 'lxml').abbr
+    assert main.get_index_status(tag) == expected
+
+
+@pytest.mark.parametrize('sample, total, expected', [
+    (30, 600, 30), (30, 10, 10), (5.0, 600, 30), (0.1, 600, 1),
+])
+def test_get_sample_size(sample, total, expected):
+    assert main.get_sample_size(sample, total) == expected
+
+
+def test_wilson_interval():
+    low, high = main.wilson_interval(0, 30)
+    assert low == 0 and 0.1 < high < 0.12
+    low, high = main.wilson_interval(15, 30)
+    assert low < 0.5 < high
+
+
+@pytest.mark.parametrize('selected, expected', [
+    (['pep'], ['pep']),
+    (['pep', 'download', 'pep'], ['pep', 'download']),
+    (['pep', 'all'], ['whats-new', 'latest-versions', 'download', 'pep']),
+    (
+        ['pep-details', 'all', 'pep-details'],
+        ['whats-new', 'latest-versions', 'download', 'pep', 'pep-details']
+    ),
+])
+def test_get_modes(selected, expected):
+    assert main.get_modes(selected) == expected
+    assert set(main.MODE_INDEX_URLS) == set(main.MODE_TO_FUNCTION)
+
+
+def test_pep_details_runs_only_explicitly():
+    assert 'pep-details' not in main.get_modes(['all'])
+    assert main.MODES['pep-details'] is main.pep_details
+    assert set(main.EXTRA_MODE_INDEX_URLS) == set(
+        main.EXTRA_MODE_TO_FUNCTION
+    )
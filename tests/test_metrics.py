@@ -0,0 +1,96 @@
+import json
+
+try:
+    from src import metrics
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+
+
+class StubResponse:
+    def __init__(self, status_code=200, content=b'', from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+
+def test_counter_and_histogram_render_prometheus():
+    registry = metrics.Registry()
+    pages = registry.counter(
+        'pages_total', 'Страницы', ('host', 'status')
+    )
+    latency = registry.histogram(
+        'latency_seconds', 'Время', ('host',), (0.1, 1)
+    )
+    pages.inc(host='peps.python.org', status=200)
+    pages.inc(2, host='peps.python.org', status=200)
+    pages.inc(host='docs.python.org', status=404)
+    latency.observe(0.05, host='peps.python.org')
+    latency.observe(0.5, host='peps.python.org')
+    latency.observe(3, host='peps.python.org')
+    text = registry.to_prometheus()
+    assert '# TYPE pages_total counter' in text
+    assert 'pages_total{host="peps.python.org",status="200"} 3' in text
+    assert 'pages_total{host="docs.python.org",status="404"} 1' in text
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{host="peps.python.org",le="0.1"} 1' in (
+        text
+    )
+    assert 'latency_seconds_bucket{host="peps.python.org",le="1"} 2' in text
+    assert (
+        'latency_seconds_bucket{host="peps.python.org",le="+Inf"} 3' in text
+    )
+    assert 'latency_seconds_sum{host="peps.python.org"} 3.55' in text
+    assert 'latency_seconds_count{host="peps.python.org"} 3' in text
+
+
+def test_label_values_are_escaped():
+    registry = metrics.Registry()
+    registry.counter('errors_total', 'Ошибки', ('status',)).inc(
+        status='Draft "new"\\'
+    )
+    assert 'errors_total{status="Draft \\"new\\"\\\\"} 1' in (
+        registry.to_prometheus()
+    )
+
+
+def test_export_by_suffix(tmp_path):
+    registry = metrics.Registry()
+    registry.gauge('duration_seconds', 'Время', ('mode',)).set(
+        1.5, mode='pep'
+    )
+    registry.export(tmp_path / 'parser.prom')
+    registry.export(tmp_path / 'nested' / 'parser.json')
+    assert 'duration_seconds{mode="pep"} 1.5' in (
+        (tmp_path / 'parser.prom').read_text(encoding='utf-8')
+    )
+    data = json.loads(
+        (tmp_path / 'nested' / 'parser.json').read_text(encoding='utf-8')
+    )
+    assert data['duration_seconds']['type'] == 'gauge'
+    assert data['duration_seconds']['samples'] == [
+        {'name': 'duration_seconds', 'labels': {'mode': 'pep'}, 'value': 1.5}
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'nested', 'parser.prom'
+    ]
+
+
+def test_record_response_separates_cache_hits():
+    host = 'metrics-test.python.org'
+    url = f'https://{host}/pep-0008/'
+    metrics.record_response(url, StubResponse(content=b'x' * 10), 0.2)
+    metrics.record_response(url, StubResponse(from_cache=True), 0.001)
+    planned = StubResponse(content=b'x' * 10)
+    planned.from_plan = True
+    metrics.record_response(url, planned, 0.2)
+    metrics.record_error(url)
+    text = metrics.registry.to_prometheus()
+    assert (
+        f'parser_pages_fetched_total{{host="{host}",status="200"}} 2' in text
+    )
+    assert f'parser_cache_hits_total{{host="{host}"}} 1' in text
+    assert f'parser_response_bytes_total{{host="{host}"}} 10' in text
+    assert f'parser_request_duration_seconds_count{{host="{host}"}} 1' in text
+    assert f'parser_request_errors_total{{host="{host}"}} 1' in text
@@ -1,4 +1,6 @@
 from datetime import datetime
+import json
+import sqlite3
 from typing import Optional
 from pathlib import Path
 import pytest
@@ -90,3 +92,58 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_control_output_file_stream(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+
+    def rows():
+        yield ('Статус', 'Количество')
+        yield ('Active', 1)
+        raise ConnectionError('Обрыв')
+
+    with pytest.raises(ConnectionError):
+        outputs.control_output(rows(), cli_args('pep', 'file'))
+    output_file, = Path(tmp_path).glob('results/*.csv')
+    assert output_file.read_text(encoding='utf-8').splitlines() == [
+        '"Статус","Количество"', '"Active","1"'
+    ], 'Строки должны записываться в файл по мере появления'
+
+
+def test_streamable():
+    @outputs.streamable
+    def mode(session):
+        yield ('Статус', 'Количество')
+
+    assert mode(None) == [('Статус', 'Количество')]
+    assert not isinstance(mode(None, stream=True), list)
+    assert mode.__name__ == 'mode'
+
+
+def test_control_output_sqlite(monkeypatch, tmp_path, records):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    monkeypatch.setattr(outputs, 'SQLITE_BATCH_SIZE', 3)
+    records = records('pep')
+    for _ in range(2):
+        outputs.control_output(records, cli_args('pep', 'sqlite'))
+    connection = sqlite3.connect(tmp_path / 'results' / 'results.sqlite')
+    assert connection.execute(
+        'SELECT COUNT(DISTINCT run_id), COUNT(*) FROM rows'
+    ).fetchone() == (2, 2 * (len(records) - 1))
+    assert connection.execute(
+        "SELECT data FROM rows WHERE mode = 'pep' AND status = 'Active'"
+    ).fetchall() == [('["Active", "36"]',)] * 2, (
+        'Статус строки должен сохраняться в отдельную колонку'
+    )
+    indexes = {row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    )}
+    assert {'rows_run', 'rows_mode_status'} <= indexes
+
+
+def test_control_output_jsonl(capsys, records):
+    records = records('pep')
+    outputs.control_output(records, cli_args('pep', 'jsonl'))
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(records) - 1
+    assert json.loads(lines[0]) == dict(zip(records[0], records[1]))
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import time
+
+import pytest
+try:
+    from src import extractors, parse_pool
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parse_pool.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parse_pool.py`'
+
+PEP_PAGE = (
+    Path(__file__).parent / 'fixture_data' / 'pep_page.html'
+).read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_parse_pool_extract(chunk_size):
+    with parse_pool.ParsePool(2, chunk_size) as pool:
+        with ThreadPoolExecutor(max_workers=7) as executor:
+            got = list(executor.map(
+                lambda _: pool.extract(
+                    extractors.extract_pep_status, PEP_PAGE
+                ),
+                range(7)
+            ))
+    assert got == ['Active'] * 7, (
+        'Пул процессов должен возвращать извлечённые значения'
+    )
+
+
+def test_parse_pool_single_caller_not_delayed(monkeypatch):
+    monkeypatch.setattr(parse_pool, 'PARSE_FLUSH_TIMEOUT', 30)
+    with parse_pool.ParsePool(1, chunk_size=8, callers=1) as pool:
+        pool.extract(extractors.extract_pep_status, PEP_PAGE)
+        started = time.monotonic()
+        for _ in range(3):
+            assert pool.extract(
+                extractors.extract_pep_status, PEP_PAGE
+            ) == 'Active'
+        elapsed = time.monotonic() - started
+    assert elapsed < 5, (
+        'Единственный поток загрузки не должен ждать PARSE_FLUSH_TIMEOUT'
+    )
+
+
+def test_parse_pool_exception():
+    with parse_pool.ParsePool(1) as pool:
+        with pytest.raises(BaseException) as excinfo:
+            pool.extract(extractors.extract_whats_new_page, '<html></html>')
+    assert excinfo.typename == 'ParserFindTagException'
@@ -0,0 +1,84 @@
+try:
+    from src import pep_store
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_store.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_store.py`'
+
+PAGES = [
+    ('https://peps.python.org/pep-0649/', ('PEP 649', {
+        'Author': 'Larry Hastings <larry at hastings.org>',
+        'Status': 'Accepted',
+        'Type': 'Standards Track',
+        'Python-Version': '3.14',
+    })),
+    ('https://peps.python.org/pep-0703/', ('PEP 703', {
+        'Author': 'Sam Gross <colesbury at gmail.com>',
+        'Status': 'Accepted',
+        'Type': 'Standards Track',
+        'Python-Version': '3.13',
+    })),
+    ('https://peps.python.org/pep-0719/', ('PEP 719', {
+        'Author': 'Thomas Wouters <thomas at python.org>',
+        'Status': 'Active',
+        'Type': 'Informational',
+        'Python-Version': '3.13',
+    })),
+    ('https://peps.python.org/pep-0008/', ('PEP 8', {
+        'Author': 'Guido van Rossum <guido at python.org>, '
+                  'Barry Warsaw <barry at python.org>',
+        'Status': 'Active',
+        'Type': 'Process',
+    })),
+]
+
+
+def test_pep_store_find(tmp_path):
+    with pep_store.PepStore(tmp_path / 'results' / 'peps.sqlite') as store:
+        store.save(PAGES)
+        accepted = store.find(
+            status='Accepted', type='Standards Track', python_version='3.13'
+        )
+        assert accepted == [(
+            703, 'PEP 703', 'Accepted', 'Standards Track',
+            'https://peps.python.org/pep-0703/'
+        )]
+        assert [row[0] for row in store.find(author='Barry Warsaw')] == [8]
+        assert [row[0] for row in store.find(status='Active')] == [8, 719]
+        assert len(store.find()) == 4
+        assert store.get_fields(PAGES[0][0]) == PAGES[0][1][1]
+
+
+def test_pep_store_replaces_pages(tmp_path):
+    path = tmp_path / 'peps.sqlite'
+    with pep_store.PepStore(path) as store:
+        store.save(PAGES)
+    url, (title, fields) = PAGES[1]
+    with pep_store.PepStore(path) as store:
+        store.save([(url, (title, {**fields, 'Status': 'Final',
+                                   'Python-Version': '3.14'}))])
+        assert store.find(python_version='3.13') == [(
+            719, 'PEP 719', 'Active', 'Informational',
+            'https://peps.python.org/pep-0719/'
+        )]
+        assert [row[0] for row in store.find(status='Final')] == [703]
+        assert len(store.find(author='Sam Gross')) == 1
+
+
+def test_pep_store_uses_indexes(tmp_path):
+    with pep_store.PepStore(tmp_path / 'peps.sqlite') as store:
+        for sql, param in (
+            ('SELECT url FROM peps WHERE status = ?', 'Accepted'),
+            ('SELECT url FROM peps WHERE type = ?', 'Process'),
+            ('SELECT url FROM pep_authors WHERE author = ?', 'Sam Gross'),
+            (
+                'SELECT url FROM pep_python_versions WHERE version = ?',
+                '3.13'
+            ),
+        ):
+            plan = ' '.join(
+                row[-1] for row in store.connection.execute(
+                    f'EXPLAIN QUERY PLAN {sql}', (param,)
+                )
+            )
+            assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan
@@ -0,0 +1,37 @@
+try:
+    from src import profiling
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+
+
+@profiling.profiled('parse')
+def parse(html):
+    return html.upper()
+
+
+@profiling.profiled('fetch', url_arg=0)
+def fetch(url):
+    return parse(url)
+
+
+def test_profiled_disabled():
+    profiling.disable()
+    assert fetch('mock://page') == 'MOCK://PAGE'
+
+
+def test_profile_run_summary(tmp_path):
+    output = tmp_path / 'run.pstats'
+    with profiling.profile_run(True, output) as profiler:
+        for number in range(3):
+            fetch(f'mock://page/{number}')
+    assert profiler.calls('fetch') == 3
+    assert profiler.calls('parse') == 3
+    assert {url for _, url, _, _ in profiler.records} == {
+        f'mock://page/{number}' for number in range(3)
+    }, 'Вложенные стадии должны учитываться по ссылке страницы'
+    summary = profiler.summary()
+    assert 'fetch' in summary and 'mock://page/0' in summary
+    assert output.exists(), 'Профиль cProfile должен сохраняться в файл'
+    assert profiling._profiler is None
@@ -0,0 +1,72 @@
+import threading
+import time
+
+try:
+    from src import scheduler, transport
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `scheduler.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `scheduler.py`'
+
+
+def test_host_limiter_rate():
+    limiter = scheduler.HostLimiter(rate=50, max_limit=10)
+    started = time.monotonic()
+    for _ in range(11):
+        limiter.acquire(1)
+        limiter.release(False, 0.01)
+    assert time.monotonic() - started >= 0.18, (
+        'Запросы к хосту не должны превышать заданную частоту'
+    )
+
+
+def test_host_limiter_priority():
+    limiter = scheduler.HostLimiter(rate=1000, max_limit=1)
+    limiter.acquire(1)
+    order = []
+
+    def request(priority, name):
+        limiter.acquire(priority)
+        order.append(name)
+        limiter.release(False, 0.01)
+
+    threads = [
+        threading.Thread(target=request, args=(1, 'leaf')),
+        threading.Thread(target=request, args=(0, 'index')),
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    limiter.release(False, 0.01)
+    for thread in threads:
+        thread.join()
+    assert order == ['index', 'leaf'], (
+        'Индексные страницы должны загружаться раньше остальных'
+    )
+
+
+def test_host_limiter_adapts():
+    limiter = scheduler.HostLimiter(rate=1000, max_limit=8)
+    for _ in range(30):
+        limiter.acquire(1)
+        limiter.release(False, 0.01)
+    assert limiter.limit == 8, 'Лимит должен расти при стабильной задержке'
+    limiter.acquire(1)
+    limiter.release(True, 0.01)
+    assert limiter.limit == 4 and limiter.throttled == 1
+    limiter.acquire(1)
+    limiter.release(False, 1.0)
+    assert limiter.limit == 3 and limiter.slowdowns == 1
+
+
+def test_scheduler_counts_throttling(stub_server, tempfile_session):
+    stub_server.pages['/pep-0008/'] = b'<html>PEP 8</html>'
+    stub_server.failures['/pep-0008/'] = [429]
+    requests_scheduler = scheduler.Scheduler(rate=100, max_concurrency=4)
+    adapter = transport.mount_transport(
+        tempfile_session, backoff_factor=0, scheduler=requests_scheduler
+    )
+    tempfile_session.get(f'{stub_server.url}/pep-0008/')
+    limiter, = requests_scheduler.hosts.values()
+    assert limiter.requests == 1 and limiter.throttled == 1
+    assert '429/503 1' in adapter.summary()
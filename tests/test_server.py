@@ -0,0 +1,127 @@
+import json
+import socket
+import threading
+
+import pytest
+import requests
+try:
+    from src import server
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+
+class CountingMode:
+    __name__ = 'pep'
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, session, **kwargs):
+        self.calls += 1
+        return [('Статус', 'Количество'), ('Final', self.calls)]
+
+
+def broken_mode(session, **kwargs):
+    raise ConnectionError('Сайт недоступен')
+
+
+@pytest.fixture
+def store():
+    return server.ResultStore(
+        None, {'pep': CountingMode(), 'latest-versions': broken_mode}
+    )
+
+
+@pytest.fixture
+def http_server(store):
+    result_server = server.create_server(store, '127.0.0.1', 0)
+    thread = threading.Thread(target=result_server.serve_forever)
+    thread.start()
+    host, port = result_server.server_address
+    yield f'http://{host}:{port}'
+    result_server.shutdown()
+    result_server.server_close()
+    thread.join()
+
+
+def test_store_computes_only_on_refresh(store):
+    assert store.get('pep') is None
+    assert store.modes['pep'].calls == 0, (
+        'Запрос без refresh не должен считать режим сам'
+    )
+    store.refresh_all()
+    assert store.get('pep')['rows'] == [['Final', 1]]
+    assert store.get('pep')['rows'] == [['Final', 1]]
+    assert store.get('pep', refresh=True)['rows'] == [['Final', 2]]
+    assert store.modes['pep'].calls == 2
+
+
+def test_store_keeps_old_results_on_error(store):
+    assert store.get('latest-versions', refresh=True) is None
+    store.results['latest-versions'] = {'rows': []}
+    assert store.get('latest-versions', refresh=True) == {'rows': []}
+
+
+def test_http_answers(store, http_server):
+    assert requests.get(f'{http_server}/pep').status_code == 503
+    store.refresh_all()
+    got = requests.get(f'{http_server}/pep').json()
+    assert got['mode'] == 'pep'
+    assert got['header'] == ['Статус', 'Количество']
+    assert got['rows'] == [['Final', 1]]
+    assert requests.get(f'{http_server}/pep?refresh=1').json()['rows'] == [
+        ['Final', 2]
+    ]
+    summary = requests.get(f'{http_server}/').json()
+    assert summary['pep'] is not None
+    assert summary['latest-versions'] is None
+    assert requests.get(f'{http_server}/download').status_code == 404
+    assert requests.get(f'{http_server}/latest-versions').status_code == 503
+
+
+def test_http_does_not_crawl_without_results(store, http_server):
+    for _ in range(3):
+        response = requests.get(f'{http_server}/pep')
+        assert response.status_code == 503
+    assert store.modes['pep'].calls == 0, (
+        'Пока фоновое обновление не записало результаты, '
+        'запросы должны сразу получать 503'
+    )
+
+
+def test_unix_socket_answers(store, tmp_path):
+    store.refresh('pep')
+    socket_path = tmp_path / 'parser.sock'
+    result_server = server.create_server(store, None, None, socket_path)
+    thread = threading.Thread(target=result_server.serve_forever)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b'GET /pep HTTP/1.0\r\n\r\n')
+            response = b''
+            while chunk := client.recv(4096):
+                response += chunk
+    finally:
+        result_server.shutdown()
+        result_server.server_close()
+        thread.join()
+    head, body = response.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.0 200')
+    assert json.loads(body)['rows'] == [['Final', 1]]
+    assert not socket_path.exists()
+
+
+def test_http_metrics(http_server):
+    requests.get(f'{http_server}/latest-versions?refresh=1')
+    response = requests.get(f'{http_server}/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+    assert 'parser_mode_failures_total{mode="latest-versions"}' in (
+        response.text
+    )
+    assert '# TYPE parser_request_duration_seconds histogram' in (
+        response.text
+    )
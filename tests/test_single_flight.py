@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+try:
+    from src import single_flight
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `single_flight.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `single_flight.py`'
+    )
+
+
+def wait_for_waiters(flights, count):
+    while flights.coalesced < count:
+        time.sleep(0.001)
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flights = single_flight.SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch(url):
+        calls.append(url)
+        release.wait()
+        return f'page {url}'
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(flights.do, 'pep-8', fetch, 'pep-8')
+            for _ in range(5)
+        ]
+        wait_for_waiters(flights, 4)
+        release.set()
+        results = [future.result() for future in futures]
+    assert results == ['page pep-8'] * 5
+    assert calls == ['pep-8'], (
+        'Одновременные вызовы с одним ключом должны выполняться один раз'
+    )
+    assert flights.do('pep-8', fetch, 'pep-8') == 'page pep-8'
+    assert calls == ['pep-8', 'pep-8'], (
+        'Завершившийся вызов не должен запоминаться'
+    )
+    assert 'объединено с уже идущими 4' in flights.summary()
+
+
+def test_single_flight_shares_errors():
+    flights = single_flight.SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait()
+        raise ConnectionError('Сайт недоступен')
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(flights.do, 'pep-8', fetch) for _ in range(3)
+        ]
+        wait_for_waiters(flights, 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+    assert not flights.flights
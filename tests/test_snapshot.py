@@ -0,0 +1,38 @@
+try:
+    from src import snapshot
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshot.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshot.py`'
+
+
+ROWS = [('pep-1', 'A'), ('pep-2', 'F'), ('pep-3', ''), ('pep-4', 'S')]
+SNAPSHOT = {
+    'pep-1': {'table_status': 'A', 'page_status': 'Active', 'checked_at': 90},
+    'pep-2': {'table_status': 'A', 'page_status': 'Active', 'checked_at': 90},
+    'pep-3': {'table_status': '', 'page_status': 'Draft', 'checked_at': 0},
+}
+
+
+def test_get_outdated_links():
+    got = snapshot.get_outdated_links(SNAPSHOT, ROWS, max_age=50, now=100)
+    assert list(got) == ['pep-2', 'pep-3', 'pep-4'], (
+        'Заново проверяются новые, изменившиеся и устаревшие PEP'
+    )
+
+
+def test_update_and_save_snapshot(tmp_path):
+    path = tmp_path / 'cache' / 'pep_snapshot.json'
+    data = snapshot.load_snapshot(path)
+    assert data == {}
+    snapshot.update_snapshot(
+        data, ROWS,
+        [('pep-2', 'Final'), ('pep-4', ConnectionError('pep-4'))],
+        now=100
+    )
+    snapshot.save_snapshot(path, data)
+    assert snapshot.load_snapshot(path) == {
+        'pep-2': {
+            'table_status': 'F', 'page_status': 'Final', 'checked_at': 100
+        },
+    }, 'Ошибки загрузки не должны попадать в снимок'
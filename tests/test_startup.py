@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SRC_DIR
+
+HEAVY_MODULES = (
+    'bs4', 'lxml', 'multiprocessing', 'prettytable', 'requests',
+    'requests_cache', 'tqdm', 'urllib3',
+)
+# С большим запасом: локально импорт main занимает десятки мс
+IMPORT_TIME_BUDGET = 0.25
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True,
+        cwd=SRC_DIR, check=True
+    )
+
+
+def get_import_time(stderr, module):
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and line.endswith(f'| {module}'):
+            return int(line.split('|')[1]) / 10 ** 6
+    raise AssertionError(f'Модуль {module} не импортировался')
+
+
+@pytest.mark.parametrize('module', ['main', 'configs', 'outputs'])
+def test_import_skips_heavy_modules(module):
+    loaded = run_python(
+        '-c', f'import sys, {module}; print(*sys.modules)'
+    ).stdout.split()
+    heavy = sorted(set(HEAVY_MODULES) & set(loaded))
+    assert not heavy, (
+        f'Импорт `{module}` не должен загружать {", ".join(heavy)}: '
+        'тяжёлые зависимости импортируются при первом использовании.'
+    )
+
+
+def test_main_import_time():
+    stderr = run_python('-X', 'importtime', '-c', 'import main').stderr
+    assert get_import_time(stderr, 'main') < IMPORT_TIME_BUDGET, (
+        'Импорт `main` занимает слишком много времени, проверьте '
+        '`python benchmarks/startup_benchmark.py`.'
+    )
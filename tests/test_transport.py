@@ -0,0 +1,31 @@
+try:
+    from src import transport
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+
+
+def test_transport_retries(stub_server, tempfile_session):
+    stub_server.pages['/pep-0008/'] = b'<html>PEP 8</html>'
+    stub_server.failures['/pep-0008/'] = [503, 429]
+    adapter = transport.mount_transport(
+        tempfile_session, retries=3, backoff_factor=0
+    )
+    response = tempfile_session.get(f'{stub_server.url}/pep-0008/')
+    assert response.status_code == 200, (
+        'Запрос должен повторяться при ответах 429 и 503'
+    )
+    assert adapter.stats.retries == 2
+    assert adapter.stats.retry_after == 2
+
+
+def test_transport_reuses_connections(stub_server, tempfile_session):
+    for number in range(5):
+        stub_server.pages[f'/pep-{number}/'] = b'<html>PEP</html>'
+    adapter = transport.mount_transport(tempfile_session, pool_size=4)
+    for number in range(5):
+        tempfile_session.get(f'{stub_server.url}/pep-{number}/')
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 10
+    summary = adapter.summary()
+    assert 'запросов 5' in summary, summary
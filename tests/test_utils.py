@@ -54,3 +54,48 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+@pytest.mark.parametrize('url, expected', [
+    (
+        'https://peps.python.org/pep-0008',
+        'https://peps.python.org/pep-0008/'
+    ),
+    (
+        'https://peps.python.org/pep-0008/#abstract',
+        'https://peps.python.org/pep-0008/'
+    ),
+    (
+        'HTTPS://Docs.Python.org:443/3/index.html',
+        'https://docs.python.org/3/'
+    ),
+    (
+        'https://docs.python.org/3/whatsnew/3.11.html#summary',
+        'https://docs.python.org/3/whatsnew/3.11.html'
+    ),
+    (
+        'http://127.0.0.1:8080/pep-1?page=2#top',
+        'http://127.0.0.1:8080/pep-1?page=2'
+    ),
+])
+def test_canonical_url(url, expected):
+    assert utils.canonical_url(url) == expected
+
+
+def test_get_response_shares_canonical_request(
+    stub_server, tempfile_session
+):
+    stub_server.pages['/pep-0008/'] = b'<html>PEP 8</html>'
+    urls = [
+        f'{stub_server.url}/pep-0008/',
+        f'{stub_server.url}/pep-0008/#abstract',
+        f'{stub_server.url}/pep-0008/index.html',
+    ]
+    deduplicated = utils.flights.deduplicated
+    for url in urls:
+        response = utils.get_response(tempfile_session, url)
+        assert response.text == '<html>PEP 8</html>'
+    assert stub_server.count('GET', '/pep-0008/') == 1, (
+        'Разные ссылки на одну страницу должны попадать в один ключ кеша'
+    )
+    assert utils.flights.deduplicated - deduplicated == 2